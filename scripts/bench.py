@@ -18,15 +18,33 @@ import csv
 import statistics
 import argparse
 import datetime
+import hashlib
+import platform
+import resource
+import asyncio
+import gzip
+import shutil
+import itertools
+import mmap
+import random
+import sqlite3
+from array import array
+from collections import deque
 from pathlib import Path
-from typing import List, Dict, Any, Tuple, Optional
-from dataclasses import dataclass, asdict
+from typing import List, Dict, Any, Tuple, Optional, Deque
+from dataclasses import dataclass, asdict, fields
 import re
 
 # Intentar importar librerías de análisis (opcionales)
 try:
-    import matplotlib.pyplot as plt
     import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+    print("⚠️  numpy no disponible - estadísticas en Python puro")
+
+try:
+    import matplotlib.pyplot as plt
     HAS_MATPLOTLIB = True
 except ImportError:
     HAS_MATPLOTLIB = False
@@ -39,6 +57,13 @@ except ImportError:
     HAS_PANDAS = False
     print("⚠️  pandas no disponible - análisis avanzado deshabilitado")
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
 # ============================================================================
 # CONFIGURACIÓN Y CONSTANTES
 # ============================================================================
@@ -53,105 +78,2281 @@ DOCS_DIR = Path("docs")
 DEFAULT_REPETITIONS = 5
 DEFAULT_TIMEOUT = 30
 WARMUP_ITERATIONS = 1
+WARMUP_TOLERANCE = 0.05  # Diferencia relativa entre warm-ups consecutivos para darlos por estables
+
+# Repeticiones adaptativas: repetir hasta que el IC 95% relativo sea menor al objetivo
+ADAPTIVE_MIN_REPETITIONS = 3
+ADAPTIVE_MAX_REPETITIONS = 20
+ADAPTIVE_TARGET_CI = 0.05     # Semiancho relativo del IC (5% de la media)
+ADAPTIVE_TIME_BUDGET = 60.0   # Segundos máximos por configuración
+GOLDEN_RATIO = (1 + 5 ** 0.5) / 2  # Búsqueda del número de hilos óptimo (--optimize)
+STREAM_LINE_LIMIT = 1024 * 1024  # Máximo de bytes por línea leída de los pipes
+
+# Espera de reposo entre repeticiones
+FIXED_REPETITION_PAUSE = 0.5        # Pausa fija cuando /proc no está disponible
+QUIESCENCE_MAX_WAIT = 3.0           # Segundos máximos esperando reposo
+QUIESCENCE_SAMPLE_INTERVAL = 0.05   # Ventana de muestreo de /proc/stat
+QUIESCENCE_BUSY_MARGIN = 0.10       # Ocupación tolerada sobre la línea base
+QUIESCENCE_FREQ_MARGIN = 0.05       # Frecuencia tolerada sobre la línea base
 
 # Archivos de resultados
 RESULTS_FILE = DATA_DIR / "benchmark_results.csv"
 ANALYSIS_FILE = DATA_DIR / "analysis_report.json"
 REPORT_FILE = DATA_DIR / "performance_report.html"
+CACHE_FILE = DATA_DIR / "result_cache.json"
+JOURNAL_FILE = DATA_DIR / "benchmark_journal.jsonl"
+RAW_OUTPUT_DIR = DATA_DIR / "raw_output"
+COLUMNAR_DIR = DATA_DIR / "results_store"  # Partes Parquet (pyarrow) o .npz (numpy)
+SWEEP_TABLE_FILE = DATA_DIR / "sweep_table.csv"
+HOSTS_FILE = DATA_DIR / "hosts.json"
+RESULTS_DB = DATA_DIR / "results.db"  # SQLite: sesiones, hosts, configuraciones y corridas
+
+# Salida cruda: sólo las últimas N líneas de cada stream quedan en memoria
+OUTPUT_TAIL_LINES = 20
+
+# Eventos de perf stat por defecto para --perf-counters
+PERF_EVENTS = ['cycles', 'instructions', 'cache-references', 'cache-misses',
+               'branch-misses', 'context-switches', 'cpu-migrations']
+
+# Histogramas de latencia: 2^7 buckets lineales por potencia de dos (error < 1%)
+HISTOGRAM_SUB_BITS = 7
+HISTOGRAM_PERCENTILES = [50, 90, 99, 99.9]
+
+# Análisis de data/pipeline_log.txt
+PIPELINE_LOG_DUP_WINDOW = 4096      # ItemIDs recientes recordados para detectar duplicados
+PIPELINE_LOG_LOOKUP_SCAN = 1024 * 1024  # Bytes explorados desde el offset indexado de un item
+PIPELINE_LOG_INDEX_MAX_GAP = 1 << 20   # Máximo salto de ItemID que agranda el índice (IDs corruptos)
+
+# Journal incremental: fsync cada N resultados o cada N segundos
+JOURNAL_FSYNC_BATCH = 10
+JOURNAL_FSYNC_INTERVAL = 5.0
+
+# Intervalos bootstrap y detección de outliers
+BOOTSTRAP_RESAMPLES = 2000          # Remuestreos con numpy
+BOOTSTRAP_RESAMPLES_PURE = 1000     # Remuestreos en Python puro
+BOOTSTRAP_MAX_SAMPLES = 1000        # Por encima se usan IC analíticos (t y estadísticos de orden)
+BOOTSTRAP_SEED = 12345
+OUTLIER_MAD_Z = 3.5                 # Z-score modificado (Iglewicz-Hoaglin)
+OUTLIER_TUKEY_K = 1.5               # Cercas de Tukey: Q1 - k·IQR, Q3 + k·IQR
+OUTLIER_MIN_SAMPLES = 4             # Con menos corridas no se marca nada
+
+# Comparación contra un baseline (--compare)
+COMPARE_ALPHA = 0.05                # Nivel de significancia del test de Mann-Whitney
+COMPARE_MIN_EFFECT = 0.05           # Cambio relativo mínimo de la mediana para reportar (5%)
+COMPARE_MIN_SAMPLES = 2             # Corridas mínimas por lado para comparar una configuración
+MWU_EXACT_MAX_SAMPLES = 40          # n1 + n2 hasta el cual Mann-Whitney usa la distribución exacta
+COMPARE_REGRESSION_EXIT = 3         # Código de salida cuando hay regresiones significativas
+
+# Umbrales de rendimiento de data/notes.txt
+MUTEX_ATOMIC_OVERHEAD_LIMIT = 0.30  # Overhead de mutex vs atomic: <30%
+RING_LOSS_LIMIT = 0.01              # Pérdida en búfer circular: <1%
+RING_BOUND_FACTOR = 2.0             # Bloqueos de un lado sobre el otro para clasificar el cuello de botella
+
+# Versión del harness: incrementarla al cambiar cómo se mide o parsea (invalida la caché)
+HARNESS_VERSION = "1.6"
 
 # Configuraciones de test para cada práctica
 PRACTICE_CONFIGS = {
     'p1_counter': {
         'executable': 'p1_counter',
         'name': 'Race Conditions en Contador',
-        'params': [
-            {'threads': 1, 'iterations': 100000},
-            {'threads': 2, 'iterations': 100000},
-            {'threads': 4, 'iterations': 100000},
-            {'threads': 8, 'iterations': 100000},
-        ],
+        # Argumentos posicionales del binario, en orden
+        'args': ['threads', 'iterations'],
+        # Barrido por defecto y barridos con nombre para --sweep (ver expand_sweep);
+        # 'recommended' son las matrices de data/notes.txt
+        'sweep': {'threads': [1, 2, 4, 8], 'iterations': 100000},
+        'presets': {
+            'recommended': {'threads': [1, 2, 4, 8, 16], 'iterations': 'log(10000,1000000,3)'},
+        },
         'metrics': ['time', 'throughput', 'correctness'],
+        # Parámetros cuyo producto da los hilos trabajadores y los items procesados
+        # (normalización del throughput por hilo y por item en las estadísticas)
+        'workers': ['threads'],
+        'work': ['threads', 'iterations'],
         'timeout': 15
     },
     'p2_ring': {
         'executable': 'p2_ring',
         'name': 'Búfer Circular Productor-Consumidor',
-        'params': [
-            {'producers': 1, 'consumers': 1, 'items': 50000},
-            {'producers': 2, 'consumers': 1, 'items': 50000},
-            {'producers': 1, 'consumers': 2, 'items': 50000},
-            {'producers': 2, 'consumers': 2, 'items': 50000},
-        ],
+        'args': ['producers', 'consumers', 'items'],
+        # El tamaño del búfer (QUEUE_SIZE) es de compilación: no es dimensión del barrido
+        'sweep': {'producers,consumers': [[1, 1], [2, 1], [1, 2], [2, 2]], 'items': 50000},
+        'presets': {
+            'recommended': {'producers,consumers': [[1, 1], [2, 1], [1, 2], [2, 2], [4, 2], [2, 4]],
+                            'items': [10000, 50000, 100000]},
+            # Proporciones P/C de 1:4 a 4:1 para ubicar el paso de consumer- a producer-bound
+            'pc_ratios': {'producers,consumers': [[1, 4], [1, 2], [1, 1], [2, 1], [4, 1], [2, 2], [4, 4]],
+                          'items': 50000},
+        },
         'metrics': ['time', 'throughput', 'efficiency'],
+        'workers': ['producers+consumers'],
+        'work': ['producers', 'items'],
         'timeout': 20
     },
     'p3_rw': {
         'executable': 'p3_rw',
         'name': 'Lectores/Escritores HashMap',
-        'params': [
-            {'threads': 2, 'operations': 50000},
-            {'threads': 4, 'operations': 50000},
-            {'threads': 8, 'operations': 50000},
-        ],
+        'args': ['threads', 'operations'],
+        # Las proporciones R/W las recorre el propio binario en cada ejecución
+        'sweep': {'threads': [2, 4, 8], 'operations': 50000},
+        'presets': {
+            'recommended': {'threads': [2, 4, 8, 16], 'operations': [10000, 50000, 100000]},
+        },
         'metrics': ['time', 'throughput', 'read_write_ratio'],
+        'workers': ['threads'],
+        'work': ['threads', 'operations'],
         'timeout': 25
     },
     'p4_deadlock': {
         'executable': 'p4_deadlock',
         'name': 'Prevención de Deadlock',
-        'params': [
-            {'threads': 2, 'skip_demo': 1},
-            {'threads': 4, 'skip_demo': 1},
-            {'threads': 8, 'skip_demo': 1},
-        ],
+        'args': ['threads', 'skip_demo'],
+        'defaults': {'skip_demo': 1},
+        'sweep': {'threads': [2, 4, 8]},
+        'presets': {
+            'recommended': {'threads': [2, 4, 6, 8]},
+        },
         'metrics': ['time', 'success_rate', 'retry_count'],
+        'workers': ['threads'],
         'timeout': 20
     },
     'p5_pipeline': {
         'executable': 'p5_pipeline',
         'name': 'Pipeline con Barreras',
-        'params': [
-            {'ticks': 500},
-            {'ticks': 1000},
-            {'ticks': 2000},
-        ],
+        'args': ['ticks'],
+        'sweep': {'ticks': [500, 1000, 2000]},
+        'presets': {
+            'recommended': {'ticks': [100, 500, 1000, 2000]},
+        },
         'metrics': ['time', 'throughput', 'latency', 'efficiency'],
-        'timeout': 30
+        'work': ['ticks'],
+        'timeout': 30,
+        # Todas las ejecuciones escriben data/pipeline_log.txt: no paralelizar configuraciones
+        'exclusive': True,
+        # Log que se analiza tras cada ejecución (ver PipelineLogAnalyzer)
+        'log_file': 'data/pipeline_log.txt'
     }
 }
 
 # ============================================================================
-# CLASES DE DATOS
+# CLASES DE DATOS
+# ============================================================================
+
+@dataclass(slots=True)
+class BenchmarkResult:
+    """Resultado de una ejecución de benchmark
+    
+    stdout/stderr guardan sólo el final de cada stream; la salida completa
+    queda comprimida en RAW_OUTPUT_DIR bajo output_ref (ver read_raw_output).
+    """
+    practice: str
+    config: str
+    timestamp: str
+    execution_time: float
+    throughput: float
+    success: bool
+    stdout: str = ""
+    stderr: str = ""
+    metrics: Dict[str, Any] = None
+    cpu_set: str = ""  # Partición de CPUs asignada al proceso ("" = sin afinidad)
+    warmup: bool = False  # Ejecución de calentamiento, excluida de estadísticas y gráficas
+    cached: bool = False  # Resultado servido desde la caché (--reuse), no re-ejecutado
+    # Uso de recursos del proceso hijo (os.wait4)
+    user_time: float = 0.0
+    system_time: float = 0.0
+    max_rss_kb: int = 0
+    voluntary_ctx_switches: int = 0
+    involuntary_ctx_switches: int = 0
+    output_ref: str = ""  # Ruta relativa (sin sufijo) de la salida cruda comprimida
+    host_id: str = ""  # Fingerprint del host (ver HOSTS_FILE)
+    outlier: bool = False  # Marcada por MAD o cercas de Tukey dentro de su configuración (se conserva)
+    
+    def __post_init__(self):
+        if self.metrics is None:
+            self.metrics = {}
+
+@dataclass
+class BenchmarkSuite:
+    """Suite completa de benchmarks para una práctica"""
+    practice: str
+    name: str
+    results: List[BenchmarkResult]
+    statistics: Dict[str, Any] = None
+    
+    def __post_init__(self):
+        if self.statistics is None:
+            self.statistics = {}
+
+# Campos de BenchmarkResult provenientes de rusage
+RUSAGE_FIELDS = ['user_time', 'system_time', 'max_rss_kb',
+                 'voluntary_ctx_switches', 'involuntary_ctx_switches']
+
+def rusage_fields(rusage: resource.struct_rusage) -> Dict[str, Any]:
+    """Convertir el rusage de un hijo en campos de BenchmarkResult"""
+    return {
+        'user_time': rusage.ru_utime,
+        'system_time': rusage.ru_stime,
+        'max_rss_kb': rusage.ru_maxrss,  # Linux reporta KB
+        'voluntary_ctx_switches': rusage.ru_nvcsw,
+        'involuntary_ctx_switches': rusage.ru_nivcsw,
+    }
+
+# ============================================================================
+# BARRIDOS DE PARÁMETROS
+# ============================================================================
+#
+# Un barrido es un diccionario {dimensión: valores}. Los valores pueden ser:
+#   - un escalar o una lista:      'threads': [1, 2, 4]
+#   - un rango entero inclusivo:   'threads': '1..16' o '1..16:2' (con paso)
+#   - una serie logarítmica:       'iterations': 'log(10000,1000000,3)'
+# Una clave con varias dimensiones separadas por coma se recorre en zip:
+#   'producers,consumers': [[1, 1], [2, 1], [1, 2]]
+# El resto de las dimensiones se combina en producto cartesiano.
+
+def parse_sweep_value(text: str) -> Any:
+    """Convertir un valor textual a int, float o str"""
+    text = text.strip()
+    for cast in (int, float):
+        try:
+            value = cast(text)
+        except ValueError:
+            continue
+        return int(value) if cast is float and value.is_integer() else value
+    return text
+
+def expand_sweep_values(values: Any) -> List[Any]:
+    """Expandir la expresión de valores de una dimensión a una lista"""
+    if isinstance(values, (list, tuple)):
+        return list(values)
+    if not isinstance(values, str):
+        return [values]
+    
+    match = re.fullmatch(r'\s*log\(([^,]+),([^,]+),([^,)]+)\)\s*', values)
+    if match:
+        start, stop = float(match.group(1)), float(match.group(2))
+        count = int(match.group(3))
+        if start <= 0 or stop <= 0 or count < 1:
+            raise ValueError(f"Serie logarítmica inválida: {values}")
+        if count == 1:
+            return [parse_sweep_value(str(round(start)))]
+        ratio = (stop / start) ** (1 / (count - 1))
+        points = [round(start * ratio ** i) for i in range(count)]
+        return list(dict.fromkeys(points))
+    
+    match = re.fullmatch(r'\s*(-?\d+)\.\.(-?\d+)(?::(\d+))?\s*', values)
+    if match:
+        start, stop = int(match.group(1)), int(match.group(2))
+        step = int(match.group(3) or 1)
+        return list(range(start, stop + 1, step))
+    
+    return [parse_sweep_value(v) for v in values.split(',')]
+
+def expand_sweep(practice: str, spec: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Expandir un barrido a la lista de configuraciones de una práctica
+    
+    Las configuraciones quedan con las claves en el orden de 'args' del binario
+    (así config_string es estable) y completadas con 'defaults'.
+    """
+    config = PRACTICE_CONFIGS[practice]
+    arg_names = config['args']
+    
+    axes = []
+    for key, values in spec.items():
+        dims = [d.strip() for d in key.split(',')]
+        unknown = [d for d in dims if d not in arg_names]
+        if unknown:
+            raise ValueError(f"Dimensión {', '.join(unknown)} no es argumento de {practice} "
+                             f"(argumentos: {', '.join(arg_names)})")
+        
+        points = expand_sweep_values(values)
+        if len(dims) == 1:
+            axes.append([{dims[0]: v} for v in points])
+        else:
+            rows = [row if isinstance(row, (list, tuple)) else str(row).split('/') for row in points]
+            if any(len(row) != len(dims) for row in rows):
+                raise ValueError(f"Cada valor de '{key}' debe tener {len(dims)} componentes")
+            axes.append([{d: parse_sweep_value(str(v)) for d, v in zip(dims, row)} for row in rows])
+    
+    missing = [a for a in arg_names if a not in config.get('defaults', {})
+               and not any(a in axis[0] for axis in axes if axis)]
+    if missing:
+        raise ValueError(f"Falta la dimensión {', '.join(missing)} para {practice}")
+    
+    grid = []
+    for combo in itertools.product(*axes):
+        merged = dict(config.get('defaults', {}))
+        for part in combo:
+            merged.update(part)
+        grid.append({name: merged[name] for name in arg_names})
+    return grid
+
+def parse_sweep_expression(expression: str) -> Dict[str, Any]:
+    """Parsear un barrido de línea de comandos
+    
+    Ej: "threads=1..16;iterations=log(1e4,1e6,3)" o "producers,consumers=1/1,2/1,1/2".
+    """
+    spec = {}
+    for part in expression.split(';'):
+        if not part.strip():
+            continue
+        if '=' not in part:
+            raise ValueError(f"Dimensión sin valores en el barrido: '{part}'")
+        key, values = part.split('=', 1)
+        spec[key.strip()] = values.strip()
+    return spec
+
+def load_sweeps(source: str, practices: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Resolver --sweep a un barrido por práctica
+    
+    source puede ser el nombre de un barrido predefinido ('recommended': matrices
+    de data/notes.txt; 'pc_ratios' en p2_ring), un archivo JSON (un barrido, o
+    {práctica: barrido}) o una expresión de línea de comandos. Un predefinido
+    se aplica sólo a las prácticas que lo definen.
+    """
+    presets = {p: PRACTICE_CONFIGS[p].get('presets', {}) for p in practices}
+    if any(source in named for named in presets.values()):
+        return {p: named[source] for p, named in presets.items() if source in named}
+    
+    path = Path(source)
+    if path.suffix == '.json' or path.is_file():
+        with open(path, 'r', encoding='utf-8') as f:
+            spec = json.load(f)
+    else:
+        spec = parse_sweep_expression(source)
+    
+    if spec and all(key in PRACTICE_CONFIGS for key in spec):
+        return {p: s for p, s in spec.items() if p in practices}
+    if len(practices) != 1:
+        raise ValueError("Un barrido sin prácticas como claves requiere indicar una sola práctica")
+    return {practices[0]: spec}
+
+def sweep_dimensions(grid: List[Dict[str, Any]]) -> List[str]:
+    """Dimensiones que efectivamente varían dentro de una grilla"""
+    if not grid:
+        return []
+    return [k for k in grid[0] if len({str(p[k]) for p in grid}) > 1]
+
+# ============================================================================
+# EXTRACCIÓN DE MÉTRICAS
+# ============================================================================
+
+class MetricExtractor:
+    """Extractor incremental de métricas desde el output de una práctica
+    
+    Recorre el texto una sola vez con un regex combinado precompilado y conserva
+    sólo el primer y el último valor de cada patrón: el costo es lineal y la
+    memoria constante sin importar cuánto imprima el binario.
+    """
+    
+    # Patrones comunes de extracción (se reporta el último valor encontrado)
+    COMMON_PATTERNS = {
+        'time': r'Tiempo[:\s]+([0-9.]+)',
+        'throughput': r'Throughput[:\s]+([0-9.]+)',
+        'operations': r'operaciones[:\s]+([0-9]+)',
+        'items_produced': r'producidos[:\s]+([0-9]+)',
+        'items_consumed': r'consumidos[:\s]+([0-9]+)',
+        'speedup': r'Speedup[:\s]+([0-9.]+)',
+        'latency': r'latencia[:\s]+([0-9.]+)',
+        'efficiency': r'eficiencia[:\s]+([0-9.]+)',
+    }
+    
+    # Patrones específicos por práctica (sensibles a mayúsculas, se usa el primer valor)
+    PRACTICE_PATTERNS = {
+        'p1_counter': {
+            'result_expected': r'Resultado:\s*(\d+).*esperado:\s*(\d+)',
+        },
+        'p2_ring': {
+            'queue_size': r'Tamaño de cola:\s*(\d+)',
+            'total_time': r'Tiempo total:\s*([0-9.]+)',
+            'items_lost': r'perdidos:\s*(-?\d+)',
+            'queue_final': r'finales en cola:\s*(\d+)',
+            'producer_blocks': r'Bloqueos de productor:\s*(\d+)',
+            'consumer_blocks': r'Bloqueos de consumidor:\s*(\d+)',
+            'production_throughput': r'Throughput producción:\s*([0-9.]+)',
+            'consumption_throughput': r'Throughput consumo:\s*([0-9.]+)',
+        },
+        'p3_rw': {
+            'reads': r'R:\s*(\d+)',
+            'writes': r'W:\s*(\d+)',
+        },
+        'p5_pipeline': {
+            'filtered': r'filtrados:\s*(\d+)',
+            'generated': r'generados:\s*(\d+)',
+        },
+    }
+    
+    # Encabezados que abren una sección del output (ej: una estrategia de p1_counter);
+    # los grupos capturados, unidos con '_', forman el nombre de la sección
+    SECTION_PATTERNS = {
+        'p1_counter': r'--- Benchmarking (\w+)',
+        'p3_rw': r'--- Benchmarking (\w+) HashMap \(R/W: (\d+)/\d+%\)',
+        'p2_ring': r'=== BENCHMARK: (\d+)P/(\d+)C',
+    }
+    
+    # Scanners compilados por práctica: (regex combinado, grupo externo -> (nombre, n_grupos))
+    _scanners: Dict[str, Tuple[re.Pattern, Dict[int, Tuple[str, int]]]] = {}
+    
+    def __init__(self, practice: str):
+        self.practice = practice
+        self.scanner, self.group_map = self.compile_scanner(practice)
+        self.first: Dict[str, Tuple[str, ...]] = {}
+        self.last: Dict[str, Tuple[str, ...]] = {}
+        # Primer valor de cada patrón dentro de cada sección
+        self.section: Optional[str] = None
+        self.sections: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+    
+    @classmethod
+    def compile_scanner(cls, practice: str) -> Tuple[re.Pattern, Dict[int, Tuple[str, int]]]:
+        """Combinar todos los patrones de una práctica en un único regex con alternativas"""
+        if practice not in cls._scanners:
+            patterns = []
+            if practice in cls.SECTION_PATTERNS:
+                patterns.append(('__section__', cls.SECTION_PATTERNS[practice], False))
+            patterns += [(name, pattern, True) for name, pattern in cls.COMMON_PATTERNS.items()]
+            patterns += [(name, pattern, False)
+                         for name, pattern in cls.PRACTICE_PATTERNS.get(practice, {}).items()]
+            
+            alternatives = []
+            group_map = {}
+            index = 1
+            for name, pattern, ignore_case in patterns:
+                inner_groups = re.compile(pattern).groups
+                alternatives.append(f"((?i:{pattern}))" if ignore_case else f"({pattern})")
+                group_map[index] = (name, inner_groups)
+                index += 1 + inner_groups
+            
+            cls._scanners[practice] = (re.compile('|'.join(alternatives)), group_map)
+        
+        return cls._scanners[practice]
+    
+    def feed(self, text: str):
+        """Procesar una o más líneas completas de output"""
+        for match in self.scanner.finditer(text):
+            outer = match.lastindex
+            name, inner_groups = self.group_map[outer]
+            values = match.group(*range(outer + 1, outer + 1 + inner_groups))
+            if inner_groups == 1:
+                values = (values,)
+            if name == '__section__':
+                # Una sección repetida (ej: la topología pedida en p2_ring) reemplaza a la anterior
+                self.section = '_'.join(values).lower()
+                self.sections[self.section] = {}
+                continue
+            self.first.setdefault(name, values)
+            self.last[name] = values
+            if self.section is not None:
+                self.sections[self.section].setdefault(name, values)
+    
+    def feed_file(self, path: Path):
+        """Procesar un archivo de output línea por línea"""
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                self.feed(line)
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Construir el diccionario de métricas con los valores acumulados"""
+        metrics = {}
+        
+        for metric_name in self.COMMON_PATTERNS:
+            if metric_name in self.last:
+                try:
+                    # Tomar el último valor encontrado
+                    metrics[metric_name] = float(self.last[metric_name][0])
+                except ValueError:
+                    pass
+        
+        # Métricas específicas por práctica
+        if self.practice == 'p1_counter':
+            # Buscar resultado vs esperado
+            if 'result_expected' in self.first:
+                actual, expected = map(int, self.first['result_expected'])
+                metrics['correctness'] = 1.0 if actual == expected else actual / expected
+            metrics.update(self.strategy_metrics())
+        
+        elif self.practice == 'p2_ring':
+            # Buscar estadísticas de productor/consumidor
+            if 'items_produced' in self.first and 'items_consumed' in self.first:
+                produced = int(self.first['items_produced'][0])
+                consumed = int(self.first['items_consumed'][0])
+                if produced > 0:
+                    metrics['efficiency'] = consumed / produced
+            if 'queue_size' in self.first:
+                metrics['queue_size'] = int(self.first['queue_size'][0])
+            metrics.update(self.topology_metrics())
+        
+        elif self.practice == 'p3_rw':
+            # Buscar proporción de lecturas/escrituras
+            if 'reads' in self.first and 'writes' in self.first:
+                reads = int(self.first['reads'][0])
+                writes = int(self.first['writes'][0])
+                total = reads + writes
+                if total > 0:
+                    metrics['read_ratio'] = reads / total
+                    metrics['write_ratio'] = writes / total
+            metrics.update(self.rw_matrix_metrics())
+        
+        elif self.practice == 'p5_pipeline':
+            # Buscar estadísticas del pipeline
+            if 'filtered' in self.first and 'generated' in self.first:
+                filtered = int(self.first['filtered'][0])
+                generated = int(self.first['generated'][0])
+                if generated > 0:
+                    metrics['filter_efficiency'] = filtered / generated
+        
+        return metrics
+    
+    def strategy_metrics(self) -> Dict[str, float]:
+        """Tiempo, throughput, updates perdidos y overhead vs atomic por estrategia de p1_counter
+        
+        Claves planas '<estrategia>_<métrica>' (ej: mutex_time, naive_lost_update_rate).
+        """
+        metrics = {}
+        for strategy, values in self.sections.items():
+            if 'time' in values:
+                metrics[f'{strategy}_time'] = float(values['time'][0])
+            if 'throughput' in values:
+                metrics[f'{strategy}_throughput'] = float(values['throughput'][0])
+            if 'result_expected' in values:
+                actual, expected = map(int, values['result_expected'])
+                if expected > 0:
+                    metrics[f'{strategy}_lost_update_rate'] = max(0.0, 1 - actual / expected)
+        
+        atomic_time = metrics.get('atomic_time')
+        if atomic_time:
+            for strategy in self.sections:
+                if f'{strategy}_time' in metrics:
+                    metrics[f'{strategy}_overhead_vs_atomic'] = metrics[f'{strategy}_time'] / atomic_time - 1
+        
+        return metrics
+    
+    def topology_metrics(self) -> Dict[str, float]:
+        """Bloqueos por item, pérdidas y throughput por topología P/C de p2_ring
+        
+        Claves planas '<P>p<C>c_<métrica>' (ej: 2p1c_producer_blocks_per_item).
+        """
+        metrics = {}
+        for section, values in self.sections.items():
+            producers, consumers = section.split('_')
+            prefix = f'{producers}p{consumers}c'
+            
+            if 'total_time' in values:
+                metrics[f'{prefix}_time'] = float(values['total_time'][0])
+            for name in ('production_throughput', 'consumption_throughput'):
+                if name in values:
+                    metrics[f'{prefix}_{name}'] = float(values[name][0])
+            
+            produced = int(values['items_produced'][0]) if 'items_produced' in values else 0
+            if produced > 0:
+                if 'items_lost' in values:
+                    metrics[f'{prefix}_loss_rate'] = int(values['items_lost'][0]) / produced
+                for name in ('producer_blocks', 'consumer_blocks'):
+                    if name in values:
+                        metrics[f'{prefix}_{name}_per_item'] = int(values[name][0]) / produced
+            if 'queue_final' in values:
+                metrics[f'{prefix}_queue_final'] = int(values['queue_final'][0])
+        
+        return metrics
+    
+    def rw_matrix_metrics(self) -> Dict[str, float]:
+        """Tiempo y throughput por tipo de lock y % de lecturas de p3_rw
+        
+        Claves planas '<lock>_<lecturas%>_<métrica>' (ej: rwlock_90_throughput)
+        y 'speedup_<lecturas%>' = throughput RWLock / throughput Mutex.
+        """
+        metrics = {}
+        for section, values in self.sections.items():
+            if 'time' in values:
+                metrics[f'{section}_time'] = float(values['time'][0])
+            if 'throughput' in values:
+                metrics[f'{section}_throughput'] = float(values['throughput'][0])
+        
+        for section in self.sections:
+            lock, read_pct = section.split('_', 1)
+            mutex = metrics.get(f'mutex_{read_pct}_throughput')
+            if lock == 'rwlock' and mutex and f'{section}_throughput' in metrics:
+                metrics[f'speedup_{read_pct}'] = metrics[f'{section}_throughput'] / mutex
+        
+        return metrics
+
+# ============================================================================
+# SALIDA CRUDA COMPRIMIDA
+# ============================================================================
+
+class OutputSpool:
+    """Vuelca un stream del hijo a un archivo gzip y conserva sólo su final en memoria"""
+    
+    def __init__(self, path: Path, tail_lines: int = OUTPUT_TAIL_LINES):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = gzip.open(path, 'wt', encoding='utf-8', compresslevel=1)
+        self.tail = deque(maxlen=tail_lines)
+    
+    def write(self, line: str):
+        self.file.write(line)
+        self.tail.append(line)
+    
+    def text(self) -> str:
+        """Últimas líneas del stream"""
+        return ''.join(self.tail)
+    
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+def raw_output_ref(practice: str, config: str) -> str:
+    """Referencia única (relativa a RAW_OUTPUT_DIR) para la salida de una ejecución"""
+    return f"{practice}/{config or 'default'}_{time.time_ns()}"
+
+def read_raw_output(output_ref: str, stream: str = 'stdout') -> str:
+    """Recuperar la salida completa ('stdout' o 'stderr') de una ejecución"""
+    path = RAW_OUTPUT_DIR / f"{output_ref}.{stream}.gz"
+    if not output_ref or not path.exists():
+        return ""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return f.read()
+
+# ============================================================================
+# CONTADORES DE HARDWARE (perf stat)
+# ============================================================================
+
+class PerfStat:
+    """Envoltorio opcional 'perf stat -x,' alrededor del binario
+    
+    Si perf no está instalado o perf_event_paranoid no permite contar los
+    eventos, queda deshabilitado y las corridas se ejecutan sin envolver.
+    """
+    
+    def __init__(self, events: List[str]):
+        self.events = events
+        self.available, self.reason = self.probe()
+    
+    def probe(self) -> Tuple[bool, str]:
+        """Verificar una vez que perf puede contar los eventos pedidos"""
+        if shutil.which('perf') is None:
+            return False, "perf no está instalado"
+        try:
+            probe = subprocess.run(['perf', 'stat', '-x,', '-e', ','.join(self.events), '--', 'true'],
+                                   capture_output=True, text=True, timeout=10)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            return False, str(e)
+        if probe.returncode != 0:
+            lines = probe.stderr.strip().splitlines()
+            return False, lines[0] if lines else f"código {probe.returncode}"
+        return True, ""
+    
+    def wrap(self, cmd_parts: List[str], output_file: Path) -> List[str]:
+        """argv que ejecuta cmd_parts bajo perf stat escribiendo el CSV en output_file"""
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        return ['perf', 'stat', '-x,', '-e', ','.join(self.events), '-o', str(output_file), '--', *cmd_parts]
+    
+    @staticmethod
+    def parse(output_file: Path) -> Dict[str, float]:
+        """Leer el CSV de perf stat como métricas 'perf_<evento>'
+        
+        Formato por línea: valor,unidad,evento,tiempo_corriendo,porcentaje,...
+        Los eventos '<not supported>' / '<not counted>' se omiten.
+        """
+        metrics = {}
+        if not output_file.exists():
+            return metrics
+        with open(output_file, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                if not line.strip() or line.startswith('#'):
+                    continue
+                fields = line.rstrip('\n').split(',')
+                if len(fields) < 3:
+                    continue
+                try:
+                    value = float(fields[0])
+                except ValueError:
+                    continue
+                event = re.sub(r'[^0-9a-zA-Z]+', '_', fields[2].split(':')[0]).strip('_').lower()
+                metrics[f'perf_{event}'] = value
+        return metrics
+    
+    @staticmethod
+    def derived(counters: Dict[str, float], operations: float) -> Dict[str, float]:
+        """IPC y eventos por operación a partir de los contadores"""
+        metrics = {}
+        if counters.get('perf_cycles'):
+            metrics['perf_ipc'] = counters.get('perf_instructions', 0.0) / counters['perf_cycles']
+        if operations > 0:
+            for name in ('cache_misses', 'branch_misses', 'context_switches', 'cpu_migrations'):
+                if f'perf_{name}' in counters:
+                    metrics[f'perf_{name}_per_op'] = counters[f'perf_{name}'] / operations
+        return metrics
+
+# ============================================================================
+# HISTOGRAMAS DE LATENCIA
+# ============================================================================
+
+class LatencyHistogram:
+    """Histograma log-lineal de latencias (estilo HDR), respaldado por un array
+    
+    Los valores se guardan en nanosegundos enteros: debajo de 2^HISTOGRAM_SUB_BITS
+    cada valor tiene su bucket y por encima cada potencia de dos se divide en
+    2^HISTOGRAM_SUB_BITS buckets lineales, con error relativo acotado (<1% con
+    7 bits). Dos histogramas se combinan sumando sus arrays de conteos.
+    """
+    
+    SUB_BUCKETS = 1 << HISTOGRAM_SUB_BITS
+    
+    def __init__(self):
+        self.counts = array('Q')
+        self.total = 0
+        self.sum_ns = 0
+        self.max_ns = 0
+    
+    @classmethod
+    def bucket_index(cls, value_ns: int) -> int:
+        if value_ns < cls.SUB_BUCKETS:
+            return value_ns
+        exponent = value_ns.bit_length() - HISTOGRAM_SUB_BITS - 1
+        return exponent * cls.SUB_BUCKETS + (value_ns >> exponent)
+    
+    @classmethod
+    def bucket_value(cls, index: int) -> float:
+        """Punto medio del rango de valores (ns) que cae en un bucket"""
+        if index < 2 * cls.SUB_BUCKETS:
+            return float(index)
+        exponent = index // cls.SUB_BUCKETS - 1
+        sub = index - exponent * cls.SUB_BUCKETS
+        return (sub << exponent) + ((1 << exponent) - 1) / 2
+    
+    def record_ms(self, value_ms: float, count: int = 1):
+        """Registrar una latencia expresada en milisegundos"""
+        value_ns = max(0, int(round(value_ms * 1e6)))
+        index = self.bucket_index(value_ns)
+        if index >= len(self.counts):
+            self.counts.extend([0] * (index + 1 - len(self.counts)))
+        self.counts[index] += count
+        self.total += count
+        self.sum_ns += value_ns * count
+        self.max_ns = max(self.max_ns, value_ns)
+    
+    def merge(self, other: 'LatencyHistogram'):
+        """Acumular otro histograma en este"""
+        if len(other.counts) > len(self.counts):
+            self.counts.extend([0] * (len(other.counts) - len(self.counts)))
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.total += other.total
+        self.sum_ns += other.sum_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+    
+    def percentile_ms(self, percentile: float) -> float:
+        """Latencia (ms) bajo la cual queda el percentil pedido"""
+        if self.total == 0:
+            return 0.0
+        target = max(1, percentile / 100 * self.total)
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return min(self.bucket_value(index), self.max_ns) / 1e6
+        return self.max_ns / 1e6
+    
+    def summary(self) -> Dict[str, float]:
+        """Conteo, media, percentiles de HISTOGRAM_PERCENTILES y máximo (en ms)"""
+        if self.total == 0:
+            return {'count': 0}
+        return {
+            'count': self.total,
+            'mean': self.sum_ns / self.total / 1e6,
+            **{f'p{q:g}': self.percentile_ms(q) for q in HISTOGRAM_PERCENTILES},
+            'max': self.max_ns / 1e6
+        }
+    
+    def cdf_ms(self) -> Tuple[List[float], List[float]]:
+        """Puntos (latencia ms, fracción acumulada) de los buckets no vacíos"""
+        xs, ys = [], []
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if count:
+                cumulative += count
+                xs.append(self.bucket_value(index) / 1e6)
+                ys.append(cumulative / self.total)
+        return xs, ys
+    
+    def encode(self) -> str:
+        """Serialización compacta 'suma,máx;índice:conteo,...' de los buckets no vacíos"""
+        buckets = ','.join(f"{i}:{c}" for i, c in enumerate(self.counts) if c)
+        return f"{self.sum_ns},{self.max_ns};{buckets}"
+    
+    @classmethod
+    def decode(cls, text: str) -> 'LatencyHistogram':
+        histogram = cls()
+        header, _, buckets = text.partition(';')
+        sum_ns, max_ns = map(int, header.split(','))
+        for item in filter(None, buckets.split(',')):
+            index, count = map(int, item.split(':'))
+            if index >= len(histogram.counts):
+                histogram.counts.extend([0] * (index + 1 - len(histogram.counts)))
+            histogram.counts[index] = count
+            histogram.total += count
+        histogram.sum_ns, histogram.max_ns = sum_ns, max_ns
+        return histogram
+
+# ============================================================================
+# ANÁLISIS DEL LOG DEL PIPELINE
+# ============================================================================
+
+class PipelineLogAnalyzer:
+    """Análisis en streaming de data/pipeline_log.txt sobre un mmap
+    
+    Recorre el log una sola vez con memoria acotada: contadores por etapa, una
+    ventana deslizante de ItemIDs para detectar líneas duplicadas y un
+    LatencyHistogram con las latencias por item. Opcionalmente
+    construye un índice ItemID -> offset para búsquedas puntuales.
+    """
+    
+    LATENCY_PATTERN = re.compile(rb'latency=([0-9.]+)ms')
+    
+    def __init__(self, path: Path, build_index: bool = False):
+        self.path = path
+        self.build_index = build_index
+        # offsets[item_id] = offset de la primera línea del item (-1 = no visto)
+        self.offsets = array('q') if build_index else None
+    
+    def analyze(self) -> Dict[str, Any]:
+        """Recorrer el log y devolver métricas agregadas"""
+        stages: Dict[str, Dict[str, Any]] = {}
+        seen: Dict[Tuple[bytes, int], None] = {}  # (etapa, ItemID) dentro de la ventana
+        max_item = -1
+        duplicates = malformed = lines = unindexed = 0
+        latencies = LatencyHistogram()
+        
+        with open(self.path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return {'lines': 0}
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                offset = 0
+                while True:
+                    line = mm.readline()
+                    if not line:
+                        break
+                    line_offset = offset
+                    offset += len(line)
+                    lines += 1
+                    
+                    parts = line.rstrip(b'\r\n').split(b',', 3)
+                    if len(parts) != 4 or not parts[0].startswith(b'Stage') or parts[0] == b'Stage':
+                        # Encabezados y líneas intercaladas por escrituras concurrentes
+                        if not line.startswith(b'Pipeline Log') and parts[0] != b'Stage':
+                            malformed += 1
+                        continue
+                    try:
+                        item_id = int(parts[1])
+                        float(parts[2])
+                        timestamp = int(parts[3].split(b' ', 1)[0])
+                    except ValueError:
+                        malformed += 1
+                        continue
+                    
+                    key = (parts[0], item_id)
+                    if key in seen:
+                        duplicates += 1
+                        continue
+                    seen[key] = None
+                    if item_id > max_item:
+                        max_item = item_id
+                        # Olvidar ItemIDs que quedaron fuera de la ventana (dict conserva el orden)
+                        while len(seen) > PIPELINE_LOG_DUP_WINDOW:
+                            oldest = next(iter(seen))
+                            if oldest[1] >= max_item - PIPELINE_LOG_DUP_WINDOW:
+                                break
+                            del seen[oldest]
+                    
+                    if self.offsets is not None and item_id >= 0:
+                        # Un ItemID corrupto enorme no debe reservar un índice gigante
+                        if item_id >= len(self.offsets) + PIPELINE_LOG_INDEX_MAX_GAP:
+                            unindexed += 1
+                        elif item_id >= len(self.offsets):
+                            self.offsets.extend([-1] * (item_id + 1 - len(self.offsets)))
+                        if item_id < len(self.offsets) and self.offsets[item_id] < 0:
+                            self.offsets[item_id] = line_offset
+                    
+                    stage = stages.setdefault(parts[0].decode(), {'items': 0, 'first_ts': timestamp,
+                                                                 'last_ts': timestamp})
+                    stage['items'] += 1
+                    stage['first_ts'] = min(stage['first_ts'], timestamp)
+                    stage['last_ts'] = max(stage['last_ts'], timestamp)
+                    
+                    match = self.LATENCY_PATTERN.search(parts[3])
+                    if match:
+                        latencies.record_ms(float(match.group(1)))
+        
+        summary: Dict[str, Any] = {
+            'lines': lines,
+            'duplicate_lines': duplicates,
+            'malformed_lines': malformed,
+            'stages': {}
+        }
+        if self.offsets is not None:
+            summary['unindexed_lines'] = unindexed
+        for name, stage in sorted(stages.items()):
+            span_ms = stage['last_ts'] - stage['first_ts']
+            summary['stages'][name] = {
+                'items': stage['items'],
+                'span_ms': span_ms,
+                'throughput': stage['items'] / (span_ms / 1000) if span_ms > 0 else None
+            }
+        
+        produced = stages.get('Stage2', stages.get('Stage1', {})).get('items', 0)
+        if produced and 'Stage3' in stages:
+            summary['filter_ratio'] = stages['Stage3']['items'] / produced
+        
+        if latencies.total:
+            summary['latency_ms'] = latencies.summary()
+            summary['latency_histogram'] = latencies.encode()
+        
+        return summary
+    
+    def lookup(self, item_id: int) -> List[str]:
+        """Líneas de un item usando el índice (requiere analyze() con build_index)"""
+        if self.offsets is None or item_id >= len(self.offsets) or self.offsets[item_id] < 0:
+            return []
+        
+        prefix_id = str(item_id).encode()
+        found = []
+        with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            mm.seek(self.offsets[item_id])
+            # Las líneas de un item quedan cerca: se explora una ventana acotada
+            end = min(len(mm), self.offsets[item_id] + PIPELINE_LOG_LOOKUP_SCAN)
+            while mm.tell() < end:
+                line = mm.readline()
+                if not line:
+                    break
+                parts = line.split(b',', 2)
+                if len(parts) == 3 and parts[1] == prefix_id:
+                    found.append(line.decode('utf-8', errors='replace').rstrip('\r\n'))
+        return found
+
+def print_pipeline_log_summary(path: Path, lookup: Optional[int] = None):
+    """Mostrar el análisis de un log del pipeline (--pipeline-log)"""
+    if not path.exists():
+        print(f"❌ Archivo no encontrado: {path}")
+        return
+    
+    analyzer = PipelineLogAnalyzer(path, build_index=lookup is not None)
+    summary = analyzer.analyze()
+    
+    print(f"\n📊 Análisis de {path}")
+    print(f"   Líneas: {summary['lines']} (duplicadas: {summary.get('duplicate_lines', 0)}, "
+          f"malformadas: {summary.get('malformed_lines', 0)})")
+    for name, stage in summary.get('stages', {}).items():
+        throughput = f"{stage['throughput']:.2f} items/s" if stage['throughput'] else "n/a"
+        print(f"   {name}: {stage['items']} items en {stage['span_ms']} ms ({throughput})")
+    if 'filter_ratio' in summary:
+        print(f"   Proporción que pasa el filtro: {summary['filter_ratio']:.1%}")
+    if 'latency_ms' in summary:
+        latency = summary['latency_ms']
+        print(f"   Latencia (ms): media {latency['mean']:.3f}, p50 {latency['p50']:.3f}, "
+              f"p90 {latency['p90']:.3f}, p99 {latency['p99']:.3f}, p99.9 {latency['p99.9']:.3f}, "
+              f"máx {latency['max']:.3f}")
+    
+    if lookup is not None:
+        print(f"\n   Item {lookup}:")
+        for line in analyzer.lookup(lookup) or ["(no encontrado)"]:
+            print(f"     {line}")
+
+# Prefijo de las métricas derivadas del log del pipeline (no son estrategias del binario)
+LOG_METRIC_PREFIX = 'log_'
+
+def pipeline_log_metrics(summary: Dict[str, Any]) -> Dict[str, float]:
+    """Aplanar el análisis del log a métricas 'log_*' de un BenchmarkResult"""
+    metrics = {
+        f'{LOG_METRIC_PREFIX}duplicate_lines': summary.get('duplicate_lines', 0),
+        f'{LOG_METRIC_PREFIX}malformed_lines': summary.get('malformed_lines', 0)
+    }
+    for name, stage in summary.get('stages', {}).items():
+        if stage['throughput'] is not None:
+            metrics[f'{LOG_METRIC_PREFIX}{name.lower()}_throughput'] = stage['throughput']
+    if 'filter_ratio' in summary:
+        metrics[f'{LOG_METRIC_PREFIX}filter_ratio'] = summary['filter_ratio']
+    for name, value in summary.get('latency_ms', {}).items():
+        if name != 'count':
+            metrics[f"{LOG_METRIC_PREFIX}latency_{name.replace('.', '_')}_ms"] = value
+    if 'latency_histogram' in summary:
+        # Histograma serializado: se combina entre repeticiones en merged_latency_histograms
+        metrics['latency_histogram'] = summary['latency_histogram']
+    return metrics
+
+def merged_latency_histograms(results: List[BenchmarkResult]) -> Dict[str, LatencyHistogram]:
+    """Combinar por configuración los histogramas de latencia de varias corridas"""
+    merged: Dict[str, LatencyHistogram] = {}
+    for result in results:
+        encoded = result.metrics.get('latency_histogram')
+        if encoded:
+            merged.setdefault(result.config, LatencyHistogram()).merge(LatencyHistogram.decode(encoded))
+    return merged
+
+# ============================================================================
+# FUNCIONES ESTADÍSTICAS
+# ============================================================================
+
+def measured_runs(results: List[BenchmarkResult]) -> List[BenchmarkResult]:
+    """Descartar las corridas de warm-up"""
+    return [r for r in results if not r.warmup]
+
+# Valores críticos t de Student (dos colas, 95%) para 1..30 grados de libertad
+T_CRITICAL_95 = [
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+]
+
+def t_critical_95(degrees_of_freedom: int) -> float:
+    """Valor crítico t al 95% (aproximación normal para más de 30 grados de libertad)"""
+    if degrees_of_freedom < 1:
+        return float('inf')
+    if degrees_of_freedom <= len(T_CRITICAL_95):
+        return T_CRITICAL_95[degrees_of_freedom - 1]
+    return 1.96
+
+def relative_ci_half_width(values: List[float]) -> float:
+    """Semiancho del intervalo de confianza al 95% de la media, relativo a la media"""
+    if len(values) < 2:
+        return float('inf')
+    mean = statistics.mean(values)
+    if mean == 0:
+        return float('inf')
+    half_width = t_critical_95(len(values) - 1) * statistics.stdev(values) / len(values) ** 0.5
+    return abs(half_width / mean)
+
+def quantile(sorted_values: List[float], q: float) -> float:
+    """Cuantil con interpolación lineal sobre una lista ya ordenada"""
+    position = (len(sorted_values) - 1) * q
+    low = int(position)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+
+def bootstrap_ci(values: List[float], stat: str = 'mean',
+                 confidence: float = 0.95) -> Optional[Tuple[float, float]]:
+    """Intervalo de confianza percentil bootstrap de la media o la mediana
+    
+    Vectorizado con numpy (remuestreo en bloques para acotar memoria) o en
+    Python puro si numpy no está. Con más de BOOTSTRAP_MAX_SAMPLES valores se
+    usa el IC t de la media o el IC por estadísticos de orden de la mediana,
+    que a ese tamaño coinciden con el bootstrap y cuestan O(n log n).
+    """
+    n = len(values)
+    if n < 2:
+        return None
+    alpha = (1 - confidence) / 2
+    
+    if n > BOOTSTRAP_MAX_SAMPLES:
+        ordered = sorted(values)
+        if stat == 'median':
+            half_width = 1.96 * n ** 0.5 / 2
+            return ordered[max(0, int(n / 2 - half_width))], ordered[min(n - 1, int(n / 2 + half_width))]
+        mean = statistics.fmean(values)
+        half_width = t_critical_95(n - 1) * statistics.stdev(values) / n ** 0.5
+        return mean - half_width, mean + half_width
+    
+    estimates = sorted(bootstrap_estimates(values, stat))
+    return quantile(estimates, alpha), quantile(estimates, 1 - alpha)
+
+def bootstrap_estimates(values: List[float], stat: str = 'mean',
+                        seed: int = BOOTSTRAP_SEED) -> List[float]:
+    """Réplicas bootstrap (sin ordenar) de la media o la mediana
+    
+    Con numpy se remuestrea en bloques de ~1M valores; sin numpy se usan
+    BOOTSTRAP_RESAMPLES_PURE réplicas con random.choices.
+    """
+    n = len(values)
+    if HAS_NUMPY:
+        data = np.asarray(values, dtype=float)
+        rng = np.random.default_rng(seed)
+        reducer = np.median if stat == 'median' else np.mean
+        chunk = max(1, 1_000_000 // n)
+        return np.concatenate([
+            reducer(data[rng.integers(0, n, size=(min(chunk, BOOTSTRAP_RESAMPLES - start), n))], axis=1)
+            for start in range(0, BOOTSTRAP_RESAMPLES, chunk)
+        ]).tolist()
+    
+    rng = random.Random(seed)
+    reducer = statistics.median if stat == 'median' else statistics.fmean
+    return [reducer(rng.choices(values, k=n)) for _ in range(BOOTSTRAP_RESAMPLES_PURE)]
+
+def bootstrap_median_difference(current: List[float], baseline: List[float],
+                                confidence: float = 0.95) -> Tuple[float, float]:
+    """IC bootstrap de mediana(current) - mediana(baseline) para muestras independientes"""
+    alpha = (1 - confidence) / 2
+    differences = sorted(c - b for c, b in zip(bootstrap_estimates(current, 'median', BOOTSTRAP_SEED),
+                                                bootstrap_estimates(baseline, 'median', BOOTSTRAP_SEED + 1)))
+    return quantile(differences, alpha), quantile(differences, 1 - alpha)
+
+def mann_whitney_exact_counts(n1: int, n2: int) -> List[int]:
+    """Número de ordenamientos con cada valor de U (0..n1·n2) bajo la hipótesis nula
+    
+    Recurrencia sobre el mayor elemento: si es de la primera muestra aporta n2
+    pares a U, c(n1, n2, u) = c(n1-1, n2, u-n2) + c(n1, n2-1, u).
+    """
+    previous = [[1] for _ in range(n2 + 1)]  # n1 = 0: sólo U = 0
+    for i in range(1, n1 + 1):
+        row = [[1]]
+        for j in range(1, n2 + 1):
+            counts = [0] * (i * j + 1)
+            for u, count in enumerate(row[j - 1]):
+                counts[u] += count
+            for u, count in enumerate(previous[j]):
+                counts[u + j] += count
+            row.append(counts)
+        previous = row
+    return previous[n2]
+
+def mann_whitney_u(current: List[float], baseline: List[float]) -> Tuple[float, float]:
+    """Test U de Mann-Whitney (dos colas)
+    
+    Sin empates y con n1 + n2 <= MWU_EXACT_MAX_SAMPLES usa la distribución
+    exacta de U; si no, la aproximación normal con corrección por empates y
+    de continuidad. Devuelve (U de current, p-valor).
+    """
+    n1, n2 = len(current), len(baseline)
+    combined = sorted([(v, 0) for v in current] + [(v, 1) for v in baseline])
+    
+    # Rangos promedio para los empates
+    ranks = [0.0] * len(combined)
+    tie_term = 0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        tie_term += (j - i + 1) ** 3 - (j - i + 1)
+        i = j + 1
+    
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    
+    n = n1 + n2
+    if tie_term == 0 and n <= MWU_EXACT_MAX_SAMPLES:
+        counts = mann_whitney_exact_counts(n1, n2)
+        total = sum(counts)
+        lower = sum(counts[:int(u) + 1]) / total
+        upper = sum(counts[int(u):]) / total
+        return u, min(1.0, 2 * min(lower, upper))
+    
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return u, 1.0
+    z = (abs(u - n1 * n2 / 2) - 0.5) / variance ** 0.5  # Corrección de continuidad
+    return u, min(1.0, 2 * (1 - statistics.NormalDist().cdf(max(z, 0.0))))
+
+def mann_whitney_min_p(n1: int, n2: int) -> float:
+    """Menor p-valor alcanzable con n1 y n2 corridas (muestras totalmente separadas)"""
+    return mann_whitney_u([float(n2 + k) for k in range(n1)], [float(k) for k in range(n2)])[1]
+
+def outlier_mask(values: List[float]) -> List[bool]:
+    """Marcar outliers por z-score modificado (MAD) o por cercas de Tukey"""
+    if len(values) < OUTLIER_MIN_SAMPLES:
+        return [False] * len(values)
+    
+    median = statistics.median(values)
+    mad = statistics.median(abs(v - median) for v in values)
+    ordered = sorted(values)
+    q1, q3 = quantile(ordered, 0.25), quantile(ordered, 0.75)
+    fence = OUTLIER_TUKEY_K * (q3 - q1)
+    
+    mask = []
+    for v in values:
+        mad_outlier = mad > 0 and 0.6745 * abs(v - median) / mad > OUTLIER_MAD_Z
+        tukey_outlier = fence > 0 and (v < q1 - fence or v > q3 + fence)
+        mask.append(mad_outlier or tukey_outlier)
+    return mask
+
+def summary_statistics(values: List[float], outliers: Optional[List[bool]] = None) -> Dict[str, Any]:
+    """Media, mediana, dispersión, CV, IC bootstrap y efecto de los outliers"""
+    mean = statistics.fmean(values)
+    stdev = statistics.stdev(values) if len(values) > 1 else 0.0
+    mean_ci = bootstrap_ci(values, 'mean')
+    median_ci = bootstrap_ci(values, 'median')
+    
+    summary = {
+        'mean': mean,
+        'median': statistics.median(values),
+        'stdev': stdev,
+        'min': min(values),
+        'max': max(values),
+        'cv': stdev / mean if mean else None,
+        'mean_ci_95': list(mean_ci) if mean_ci else None,
+        'median_ci_95': list(median_ci) if median_ci else None,
+    }
+    
+    if outliers is not None:
+        kept = [v for v, flagged in zip(values, outliers) if not flagged]
+        summary['outliers'] = sum(outliers)
+        summary['mean_without_outliers'] = statistics.fmean(kept) if kept else None
+    
+    return summary
+
+# ============================================================================
+# MODELOS DE ESCALABILIDAD
+# ============================================================================
+#
+# Amdahl:  X(N) = λN / (1 + σ(N-1))
+# USL:     X(N) = λN / (1 + σ(N-1) + κN(N-1))
+# Ambas se linealizan como N/X = a + b(N-1) [+ c·N(N-1)], con λ = 1/a,
+# σ = b/a y κ = c/a, y se ajustan por mínimos cuadrados ordinarios.
+
+def least_squares(rows: List[List[float]], ys: List[float]) -> Optional[List[float]]:
+    """Resolver mínimos cuadrados por ecuaciones normales (None si es singular)"""
+    k = len(rows[0])
+    # Matriz aumentada [XᵀX | Xᵀy]
+    matrix = [[sum(r[i] * r[j] for r in rows) for j in range(k)] +
+              [sum(r[i] * y for r, y in zip(rows, ys))] for i in range(k)]
+    
+    for col in range(k):
+        pivot = max(range(col, k), key=lambda i: abs(matrix[i][col]))
+        if abs(matrix[pivot][col]) < 1e-12:
+            return None
+        matrix[col], matrix[pivot] = matrix[pivot], matrix[col]
+        for i in range(k):
+            if i != col:
+                factor = matrix[i][col] / matrix[col][col]
+                matrix[i] = [a - factor * b for a, b in zip(matrix[i], matrix[col])]
+    
+    return [matrix[i][k] / matrix[i][i] for i in range(k)]
+
+def r_squared(observed: List[float], predicted: List[float]) -> Optional[float]:
+    """Coeficiente de determinación del ajuste"""
+    mean = statistics.mean(observed)
+    total = sum((y - mean) ** 2 for y in observed)
+    if total == 0:
+        return None
+    return 1 - sum((y - p) ** 2 for y, p in zip(observed, predicted)) / total
+
+def fit_scalability(points: Dict[int, float]) -> Dict[str, Any]:
+    """Ajustar Amdahl y USL a throughput medio por número de hilos"""
+    threads = sorted(n for n, x in points.items() if x > 0)
+    fits: Dict[str, Any] = {'amdahl': None, 'usl': None}
+    if len(threads) < 2:
+        return fits
+    
+    observed = [points[n] for n in threads]
+    ys = [n / points[n] for n in threads]
+    
+    coef = least_squares([[1.0, n - 1.0] for n in threads], ys)
+    if coef and coef[0] > 0:
+        lam, sigma = 1 / coef[0], coef[1] / coef[0]
+        predicted = [lam * n / (1 + sigma * (n - 1)) for n in threads]
+        fits['amdahl'] = {
+            'lambda': lam,
+            'sigma': sigma,
+            # Speedup asintótico 1/σ (sin límite si σ <= 0)
+            'max_speedup': 1 / sigma if sigma > 0 else None,
+            'r_squared': r_squared(observed, predicted)
+        }
+    
+    if len(threads) >= 3:
+        coef = least_squares([[1.0, n - 1.0, n * (n - 1.0)] for n in threads], ys)
+        if coef and coef[0] > 0:
+            lam, sigma, kappa = 1 / coef[0], coef[1] / coef[0], coef[2] / coef[0]
+            predicted = [lam * n / (1 + sigma * (n - 1) + kappa * n * (n - 1)) for n in threads]
+            
+            # Con κ > 0 el throughput tiene un máximo en N* = sqrt((1-σ)/κ)
+            peak = (1 - sigma) / kappa if kappa > 0 and sigma < 1 else None
+            peak_threads = peak ** 0.5 if peak else None
+            
+            # Qué término penaliza más en el mayor N medido
+            n_max = threads[-1]
+            contention = max(sigma, 0.0) * (n_max - 1)
+            coherency = max(kappa, 0.0) * n_max * (n_max - 1)
+            if max(contention, coherency) < 0.05:
+                regime = 'linear'
+            else:
+                regime = 'coherency' if coherency > contention else 'contention'
+            
+            fits['usl'] = {
+                'lambda': lam,
+                'sigma': sigma,
+                'kappa': kappa,
+                'peak_threads': peak_threads,
+                'peak_throughput': (lam * peak_threads / (1 + sigma * (peak_threads - 1) +
+                                                          kappa * peak_threads * (peak_threads - 1))
+                                    if peak_threads else None),
+                'r_squared': r_squared(observed, predicted),
+                'regime': regime
+            }
+    
+    return fits
+
+# ============================================================================
+# CACHÉ DE RESULTADOS
+# ============================================================================
+
+def config_string(params: Dict[str, Any]) -> str:
+    """Identificador textual de una configuración (ej: 'threads=4_iterations=100000')"""
+    return '_'.join(f"{k}={v}" for k, v in params.items())
+
+def result_from_dict(data: Dict[str, Any]) -> BenchmarkResult:
+    """Reconstruir un BenchmarkResult desde un diccionario (ignora campos desconocidos)"""
+    known = {f.name for f in fields(BenchmarkResult)}
+    return BenchmarkResult(**{k: v for k, v in data.items() if k in known})
+
+def read_sysfs(path: Path) -> Optional[str]:
+    """Contenido de un archivo de /sys o /proc (None si no existe o no se puede leer)"""
+    try:
+        return path.read_text().strip()
+    except OSError:
+        return None
+
+def cpu_core_map() -> Dict[int, Tuple[int, int]]:
+    """CPU lógico -> (socket, core físico) desde /sys/devices/system/cpu"""
+    core_map = {}
+    for topology in Path('/sys/devices/system/cpu').glob('cpu[0-9]*/topology'):
+        package = read_sysfs(topology / 'physical_package_id')
+        core = read_sysfs(topology / 'core_id')
+        if package is None or core is None:
+            continue
+        try:
+            core_map[int(topology.parent.name[3:])] = (int(package), int(core))
+        except ValueError:
+            continue
+    return core_map
+
+def cpu_topology() -> Dict[str, Any]:
+    """Sockets, cores físicos e hilos por core desde /sys/devices/system/cpu"""
+    core_map = cpu_core_map()
+    cores = set(core_map.values())
+    sockets = {package for package, _ in cores}
+    logical = len(core_map)
+    
+    if not logical:
+        return {}
+    return {
+        'sockets': len(sockets),
+        'physical_cores': len(cores),
+        'logical_cpus': logical,
+        'threads_per_core': logical // len(cores) if cores else None,
+        'online': read_sysfs(Path('/sys/devices/system/cpu/online'))
+    }
+
+def cpu_caches() -> Dict[str, str]:
+    """Tamaños de caché vistos por cpu0 (ej: {'L1d': '48K', 'L2': '1280K'})"""
+    caches = {}
+    for index in sorted(Path('/sys/devices/system/cpu/cpu0/cache').glob('index[0-9]*')):
+        level = read_sysfs(index / 'level')
+        kind = read_sysfs(index / 'type')
+        size = read_sysfs(index / 'size')
+        if level and size:
+            suffix = {'Data': 'd', 'Instruction': 'i'}.get(kind or '', '')
+            caches[f'L{level}{suffix}'] = size
+    return caches
+
+def cpu_model() -> Optional[str]:
+    """Nombre del modelo de CPU desde /proc/cpuinfo"""
+    cpuinfo = read_sysfs(Path('/proc/cpuinfo')) or ''
+    match = re.search(r'^(?:model name|Hardware|cpu model)\s*:\s*(.+)$', cpuinfo, re.MULTILINE)
+    return match.group(1).strip() if match else platform.processor() or None
+
+def build_info() -> Dict[str, Any]:
+    """Compilador y flags del Makefile con los que se construyen los binarios"""
+    variables = {}
+    makefile = read_sysfs(Path('Makefile')) or ''
+    for name in ('CXX', 'CXXFLAGS'):
+        match = re.search(rf'^{name}\s*[:?]?=\s*(.*)$', makefile, re.MULTILINE)
+        if match:
+            variables[name] = match.group(1).strip()
+    
+    compiler = variables.get('CXX', 'g++')
+    try:
+        version = subprocess.run([compiler, '--version'], capture_output=True, text=True, timeout=10)
+        compiler_version = version.stdout.splitlines()[0] if version.stdout else None
+    except (OSError, subprocess.TimeoutExpired):
+        compiler_version = None
+    
+    return {'compiler': compiler, 'compiler_version': compiler_version, 'cxxflags': variables.get('CXXFLAGS')}
+
+def host_fingerprint() -> Dict[str, Any]:
+    """Datos del host, la CPU y el build que afectan la comparabilidad de resultados"""
+    kernel = platform.release()
+    return {
+        'hostname': platform.node(),
+        'machine': platform.machine(),
+        'kernel': kernel,
+        'virtualization': 'wsl' if 'microsoft' in kernel.lower() else None,
+        'cpu_model': cpu_model(),
+        'cpu_count': os.cpu_count(),
+        'cpus_allowed': len(available_cpus()),
+        'topology': cpu_topology(),
+        'caches': cpu_caches(),
+        'governor': read_sysfs(Path('/sys/devices/system/cpu/cpu0/cpufreq/scaling_governor')),
+        'build': build_info(),
+    }
+
+def fingerprint_id(fingerprint: Dict[str, Any]) -> str:
+    """Identificador corto y estable de un fingerprint de host"""
+    material = json.dumps(fingerprint, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(material).hexdigest()[:16]
+
+def register_host(host_id: str, fingerprint: Dict[str, Any], path: Path = HOSTS_FILE):
+    """Guardar el fingerprint en el registro de hosts (host_id -> fingerprint)"""
+    hosts = load_hosts(path)
+    if hosts.get(host_id) == fingerprint:
+        return
+    hosts[host_id] = fingerprint
+    path.parent.mkdir(exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(hosts, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def load_hosts(path: Path = HOSTS_FILE) -> Dict[str, Dict[str, Any]]:
+    """Registro de hosts conocidos"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def describe_host(host_id: str, hosts: Dict[str, Dict[str, Any]]) -> str:
+    """Descripción corta de un host para encabezados de análisis"""
+    fingerprint = hosts.get(host_id)
+    if not fingerprint:
+        return host_id or "host desconocido"
+    topology = fingerprint.get('topology') or {}
+    cores = (f"{topology.get('physical_cores')}C/{topology.get('logical_cpus')}T"
+             if topology else f"{fingerprint.get('cpu_count')} CPUs")
+    return f"{host_id} - {fingerprint.get('cpu_model') or fingerprint.get('machine')} ({cores}, {fingerprint.get('kernel')})"
+
+class ResultCache:
+    """Caché de resultados direccionada por contenido
+    
+    La clave combina el hash del binario en bin/, el diccionario exacto de
+    parámetros, el fingerprint del host y la versión del harness: recompilar una
+    práctica, cambiar de máquina o de harness invalida sólo lo afectado.
+    """
+    
+    def __init__(self, path: Path = CACHE_FILE, host_id: Optional[str] = None):
+        self.path = path
+        self.host_id = host_id or fingerprint_id(host_fingerprint())
+        self.binary_hashes: Dict[Tuple[str, int, int], str] = {}
+        self.dirty = False
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        
+        if path.exists():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+    
+    def binary_hash(self, executable_path: Path) -> str:
+        """SHA-256 del ejecutable (memorizado por ruta, tamaño y mtime)"""
+        stat = executable_path.stat()
+        memo_key = (str(executable_path), stat.st_size, stat.st_mtime_ns)
+        if memo_key not in self.binary_hashes:
+            digest = hashlib.sha256()
+            with open(executable_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(chunk)
+            self.binary_hashes[memo_key] = digest.hexdigest()
+        return self.binary_hashes[memo_key]
+    
+    def key(self, practice: str, params: Dict[str, Any],
+            perf_events: Optional[List[str]] = None) -> str:
+        """Clave de caché de una configuración (los eventos de perf cambian lo medido)"""
+        material = {
+            'binary': self.binary_hash(BIN_DIR / PRACTICE_CONFIGS[practice]['executable']),
+            'practice': practice,
+            'params': params,
+            'host': self.host_id,
+            'harness': HARNESS_VERSION,
+        }
+        if perf_events:
+            material['perf'] = perf_events
+        return hashlib.sha256(json.dumps(material, sort_keys=True).encode('utf-8')).hexdigest()
+    
+    def lookup(self, key: str, needed: int) -> Optional[List[BenchmarkResult]]:
+        """Resultados cacheados si hay al menos `needed` repeticiones exitosas"""
+        entry = self.entries.get(key)
+        if not entry or len(entry['results']) < needed:
+            return None
+        results = [result_from_dict(data) for data in entry['results']]
+        for result in results:
+            result.cached = True
+        return results
+    
+    def store(self, key: str, results: List[BenchmarkResult]):
+        """Guardar las repeticiones medidas y exitosas de una configuración"""
+        successful_results = [r for r in measured_runs(results) if r.success and not r.cached]
+        if not successful_results:
+            return
+        self.entries[key] = {
+            'stored_at': datetime.datetime.now().isoformat(),
+            # Sin stdout/stderr para mantener la caché compacta
+            'results': [{k: v for k, v in asdict(r).items() if k not in ('stdout', 'stderr')}
+                        for r in successful_results]
+        }
+        self.dirty = True
+    
+    def save(self):
+        """Escribir la caché de forma atómica"""
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+# ============================================================================
+# JOURNAL INCREMENTAL
+# ============================================================================
+
+class ResultJournal:
+    """Journal append-only de resultados para sobrevivir a Ctrl-C, timeouts u OOM
+    
+    Cada repetición medida se escribe como una línea JSON apenas termina; el
+    fsync se agrupa cada JOURNAL_FSYNC_BATCH líneas o JOURNAL_FSYNC_INTERVAL
+    segundos. Con --resume se recargan las repeticiones ya registradas.
+    
+    Al terminar un barrido (resultados guardados) el journal se elimina; uno que
+    sigue con entradas pertenece a un barrido interrumpido y no se sobrescribe
+    salvo que se reanude.
+    """
+    
+    def __init__(self, path: Path = JOURNAL_FILE, resume: bool = False):
+        self.path = path
+        self.completed: Dict[Tuple[str, str], Dict[int, BenchmarkResult]] = {}
+        self.pending = 0
+        self.last_sync = time.time()
+        
+        if resume and path.exists():
+            self.load()
+        elif self.unfinished(path):
+            raise FileExistsError(f"{path} tiene repeticiones de un barrido interrumpido - "
+                                  f"use --resume para continuarlo o elimínelo para empezar de cero")
+        
+        path.parent.mkdir(exist_ok=True)
+        self.file = open(path, 'a' if resume else 'w', encoding='utf-8')
+    
+    @staticmethod
+    def unfinished(path: Path) -> bool:
+        """True si el journal existe y tiene entradas de un barrido sin terminar"""
+        return path.exists() and path.stat().st_size > 0
+    
+    def load(self):
+        """Recargar las repeticiones registradas (tolera una última línea truncada)"""
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                result = result_from_dict(entry['result'])
+                self.completed.setdefault((result.practice, result.config), {})[entry['rep']] = result
+    
+    def completed_runs(self, practice: str, config: str) -> List[BenchmarkResult]:
+        """Repeticiones ya registradas de una configuración, en orden"""
+        runs = self.completed.get((practice, config), {})
+        return [runs[rep] for rep in sorted(runs)]
+    
+    def record(self, result: BenchmarkResult, rep: int):
+        """Agregar una repetición medida al journal"""
+        data = {k: v for k, v in asdict(result).items() if k not in ('stdout', 'stderr')}
+        self.file.write(json.dumps({'rep': rep, 'result': data}, ensure_ascii=False) + '\n')
+        self.file.flush()
+        self.pending += 1
+        
+        if self.pending >= JOURNAL_FSYNC_BATCH or time.time() - self.last_sync >= JOURNAL_FSYNC_INTERVAL:
+            self.sync()
+    
+    def sync(self):
+        """Forzar a disco las líneas pendientes"""
+        if self.pending:
+            os.fsync(self.file.fileno())
+            self.pending = 0
+        self.last_sync = time.time()
+    
+    def close(self):
+        """Sincronizar y cerrar el journal"""
+        if not self.file.closed:
+            self.sync()
+            self.file.close()
+    
+    def finish(self):
+        """Cerrar y eliminar el journal de un barrido cuyos resultados ya se guardaron"""
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+# ============================================================================
+# ALMACÉN COLUMNAR
+# ============================================================================
+
+METRIC_COLUMN_PREFIX = "metrics."
+COLUMNAR_CHUNK_ROWS = 100_000        # Filas por parte al convertir CSVs grandes
+# Campos del resultado que no se guardan en columnas (salida cruda en output_ref)
+COLUMNAR_EXCLUDED_FIELDS = ('stdout', 'stderr', 'metrics')
+
+def result_from_csv_row(row: Dict[str, str]) -> BenchmarkResult:
+    """Reconstruir un BenchmarkResult desde una fila de benchmark_results.csv"""
+    data: Dict[str, Any] = {}
+    for field in fields(BenchmarkResult):
+        value = row.get(field.name)
+        if value is None or field.name == 'metrics':
+            continue
+        if field.type is bool:
+            data[field.name] = value.lower() == 'true'
+        elif field.type is float:
+            data[field.name] = float(value) if value else 0.0
+        elif field.type is int:
+            data[field.name] = int(float(value)) if value else 0
+        else:
+            data[field.name] = value
+    data['metrics'] = json.loads(row.get('additional_metrics') or '{}')
+    return result_from_dict(data)
+
+# Columnas sin las cuales una fila de CSV no describe una corrida
+CSV_REQUIRED_COLUMNS = ['practice', 'config', 'timestamp', 'execution_time', 'throughput', 'success']
+
+class CsvResultReader:
+    """Iterar BenchmarkResult desde un CSV de resultados validando el esquema
+    
+    Un header sin CSV_REQUIRED_COLUMNS (ej: el formato antiguo con
+    time_seconds) lanza ValueError antes de leer filas. Las filas de
+    comentario ('#'), incompletas o con valores ilegibles se omiten y se
+    cuentan en `skipped`.
+    """
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self.skipped = 0
+    
+    def __iter__(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            missing = [column for column in CSV_REQUIRED_COLUMNS if column not in (reader.fieldnames or [])]
+            if missing:
+                raise ValueError(f"{self.path} no es un CSV de resultados reconocido "
+                                 f"(faltan columnas: {', '.join(missing)})")
+            
+            for row in reader:
+                if (row.get('practice') or '').lstrip().startswith('#') or \
+                        any(not row.get(column) for column in CSV_REQUIRED_COLUMNS):
+                    self.skipped += 1
+                    continue
+                try:
+                    yield result_from_csv_row(row)
+                except (ValueError, TypeError):
+                    self.skipped += 1
+
+def typed_column(values: List[Any]):
+    """Arreglo numpy tipado para una columna: bool, int64, float64 (NaN si falta) o texto"""
+    present = [v for v in values if v is not None]
+    if present and all(isinstance(v, bool) for v in present):
+        return np.array([bool(v) for v in values], dtype=bool)
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+        if len(present) == len(values) and all(isinstance(v, int) for v in present):
+            return np.array(values, dtype=np.int64)
+        return np.array([float('nan') if v is None else float(v) for v in values], dtype=np.float64)
+    return np.array(['' if v is None else v if isinstance(v, str) else json.dumps(v) for v in values], dtype=str)
+
+class ColumnarStore:
+    """Resultados en columnas tipadas, una parte por sesión
+    
+    Cada llamada a append escribe una parte nueva (Parquet si pyarrow está
+    disponible, si no .npz comprimido) con los campos del resultado y las
+    métricas aplanadas como columnas 'metrics.<clave>'. La lectura sólo carga
+    las columnas pedidas; las partes sin una métrica la completan con NaN/''.
+    """
+    
+    def __init__(self, path: Path = COLUMNAR_DIR):
+        self.path = path
+        self.backend = 'parquet' if HAS_PYARROW else 'npz' if HAS_NUMPY else None
+    
+    def parts(self) -> List[Path]:
+        """Partes legibles del almacén, en orden de escritura
+        
+        Las partes Parquet sin pyarrow instalado no se pueden leer: se avisa
+        en lugar de omitirlas en silencio.
+        """
+        if not self.path.is_dir():
+            return []
+        if not HAS_PYARROW:
+            skipped = len(list(self.path.glob('*.parquet')))
+            if skipped:
+                print(f"⚠️  {skipped} partes Parquet de {self.path} omitidas: instale pyarrow para leerlas")
+        patterns = (['*.parquet'] if HAS_PYARROW else []) + (['*.npz'] if HAS_NUMPY else [])
+        return sorted(part for pattern in patterns for part in self.path.glob(pattern))
+    
+    def columns_from_results(self, results: List[BenchmarkResult]) -> Dict[str, Any]:
+        """Columnas tipadas (métricas aplanadas) para una lista de resultados"""
+        names = [f.name for f in fields(BenchmarkResult) if f.name not in COLUMNAR_EXCLUDED_FIELDS]
+        columns = {name: typed_column([getattr(r, name) for r in results]) for name in names}
+        
+        metric_keys = dict.fromkeys(key for r in results for key in r.metrics)
+        for key in metric_keys:
+            columns[METRIC_COLUMN_PREFIX + key] = typed_column([r.metrics.get(key) for r in results])
+        return columns
+    
+    def append(self, results: List[BenchmarkResult]) -> Optional[Path]:
+        """Escribir los resultados como una parte nueva (None si no hay backend)"""
+        if not results or self.backend is None:
+            return None
+        
+        self.path.mkdir(parents=True, exist_ok=True)
+        columns = self.columns_from_results(results)
+        stem = f"part-{datetime.datetime.now():%Y%m%d-%H%M%S-%f}-{os.getpid()}"
+        
+        if self.backend == 'parquet':
+            part = self.path / f"{stem}.parquet"
+            pq.write_table(pa.table(columns), part, compression='zstd')
+        else:
+            part = self.path / f"{stem}.npz"
+            # np.savez añade la extensión: se escribe a un temporal y se renombra al terminar
+            tmp = self.path / f".{stem}.tmp.npz"
+            np.savez_compressed(tmp, **columns)
+            tmp.replace(part)
+        return part
+    
+    def read_part(self, part: Path, columns: Optional[List[str]] = None) -> Tuple[int, Dict[str, Any]]:
+        """Filas y columnas presentes de una parte (todas si columns es None)"""
+        if part.suffix == '.parquet':
+            available = pq.read_schema(part).names
+            wanted = [c for c in available if columns is None or c in columns]
+            table = pq.read_table(part, columns=wanted)
+            return pq.read_metadata(part).num_rows, {name: table.column(name).to_numpy(zero_copy_only=False)
+                                                     for name in wanted}
+        
+        with np.load(part, allow_pickle=False) as npz:
+            # NpzFile descomprime cada arreglo sólo al accederlo; 'success' (bool) es el más barato
+            size = len(npz['success' if 'success' in npz.files else npz.files[0]]) if npz.files else 0
+            return size, {name: npz[name] for name in npz.files if columns is None or name in columns}
+    
+    def read(self, columns: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Concatenar las columnas pedidas de todas las partes
+        
+        El tipo de cada columna se unifica entre todas las partes (np.result_type);
+        en las partes que no la tienen se completa con NaN (numéricas y bool,
+        que pasan a float64) o '' (texto).
+        """
+        chunks = [self.read_part(part, columns) for part in self.parts()]
+        names = list(columns) if columns is not None else list(dict.fromkeys(n for _, c in chunks for n in c))
+        
+        result = {}
+        for name in names:
+            present = [chunk[name] for _, chunk in chunks if name in chunk]
+            if not present:
+                continue
+            
+            try:
+                dtype = np.result_type(*present)
+            except TypeError:
+                dtype = np.dtype(object)
+            missing = len(present) < len(chunks)
+            if missing and dtype.kind in 'biu':
+                dtype = np.dtype(np.float64)
+            fill = float('nan') if dtype.kind in 'fO' else ''
+            
+            pieces = [chunk[name].astype(dtype) if name in chunk else np.full(size, fill, dtype=dtype)
+                      for size, chunk in chunks]
+            result[name] = np.concatenate(pieces)
+        return result
+    
+    def rows(self, columns: List[str]):
+        """Iterar filas (diccionarios) con sólo las columnas pedidas"""
+        data = self.read(columns)
+        names = [c for c in columns if c in data]
+        for values in zip(*(data[name].tolist() for name in names)):
+            yield dict(zip(names, values))
+    
+    def convert_csv(self, csv_file: Path) -> Tuple[int, int]:
+        """Importar un CSV de resultados (métricas JSON -> columnas tipadas)
+        
+        Devuelve (filas convertidas, filas omitidas); ValueError si el esquema no es reconocido.
+        """
+        total = 0
+        batch: List[BenchmarkResult] = []
+        reader = CsvResultReader(csv_file)
+        for result in reader:
+            batch.append(result)
+            if len(batch) >= COLUMNAR_CHUNK_ROWS:
+                self.append(batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            self.append(batch)
+            total += len(batch)
+        return total, reader.skipped
+
+# ============================================================================
+# BASE DE DATOS DE RESULTADOS
+# ============================================================================
+
+DB_BATCH_ROWS = 5000                 # Filas por executemany dentro de la transacción
+
+# Columnas de runs consultables directamente; el resto de métricas vive en run_metrics
+DB_RUN_COLUMNS = ['execution_time', 'throughput', *RUSAGE_FIELDS]
+DB_SIMPLE_STATS = ('count', 'mean', 'stdev', 'min', 'max')
+
+def percentile_fraction(stat: str) -> float:
+    """'median' o 'pNN' (0 <= NN <= 100) -> fracción en [0, 1]; ValueError si no es válido"""
+    if stat == 'median':
+        return 0.5
+    match = re.fullmatch(r'p(\d+(?:\.\d+)?)', stat)
+    if not match or not 0 <= float(match.group(1)) <= 100:
+        raise ValueError(f"agregado desconocido: {stat} (use {', '.join(DB_SIMPLE_STATS)}, median o pNN con 0 <= NN <= 100)")
+    return float(match.group(1)) / 100
+
+DB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    started TEXT NOT NULL,
+    harness_version TEXT,
+    host_id TEXT,
+    command TEXT,
+    log_file TEXT
+);
+CREATE TABLE IF NOT EXISTS hosts (
+    host_id TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    first_seen TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS configs (
+    id INTEGER PRIMARY KEY,
+    practice TEXT NOT NULL,
+    config TEXT NOT NULL,
+    params TEXT NOT NULL,
+    UNIQUE (practice, config)
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    session_id INTEGER NOT NULL REFERENCES sessions(id),
+    config_id INTEGER NOT NULL REFERENCES configs(id),
+    host_id TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    execution_time REAL,
+    throughput REAL,
+    success INTEGER,
+    warmup INTEGER,
+    cached INTEGER,
+    outlier INTEGER,
+    user_time REAL,
+    system_time REAL,
+    max_rss_kb INTEGER,
+    voluntary_ctx_switches INTEGER,
+    involuntary_ctx_switches INTEGER,
+    cpu_set TEXT,
+    output_ref TEXT
+);
+CREATE TABLE IF NOT EXISTS run_metrics (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    name TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (run_id, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS runs_config_time ON runs (config_id, timestamp);
+-- Cubre el filtro por defecto de query (exitosas, sin warm-up ni caché) sobre execution_time
+CREATE INDEX IF NOT EXISTS runs_config_measured ON runs (config_id, success, warmup, cached, timestamp, execution_time);
+CREATE INDEX IF NOT EXISTS runs_host_time ON runs (host_id, timestamp);
+CREATE INDEX IF NOT EXISTS runs_time ON runs (timestamp);
+CREATE INDEX IF NOT EXISTS configs_practice ON configs (practice, config);
+"""
+
+def parse_config_string(config: str) -> Dict[str, Any]:
+    """Inverso de config_string: 'threads=2_skip_demo=1' -> {'threads': 2, 'skip_demo': 1}"""
+    params: Dict[str, Any] = {}
+    for name, value in re.findall(r'(?:^|_)([a-z][a-z_]*)=([^_=]+)', config):
+        try:
+            params[name] = int(value)
+        except ValueError:
+            params[name] = value
+    return params
+
+class ResultDatabase:
+    """Histórico de resultados en SQLite (modo WAL)
+    
+    Cada sesión de benchmark inserta sus corridas en una sola transacción con
+    executemany por lotes; las métricas numéricas adicionales van a
+    run_metrics (una fila por métrica). Las consultas por práctica,
+    configuración, host y rango de fechas usan los índices de runs.
+    """
+    
+    def __init__(self, path: Path = RESULTS_DB):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(DB_SCHEMA)
+    
+    def close(self):
+        self.conn.close()
+    
+    def config_ids(self, results: List[BenchmarkResult]) -> Dict[Tuple[str, str], int]:
+        """Ids de configs para los resultados, creando las que falten"""
+        keys = list(dict.fromkeys((r.practice, r.config) for r in results))
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO configs (practice, config, params) VALUES (?, ?, ?)",
+            [(practice, config, json.dumps(parse_config_string(config))) for practice, config in keys])
+        ids = {}
+        for practice, config in keys:
+            row = self.conn.execute("SELECT id FROM configs WHERE practice = ? AND config = ?",
+                                    (practice, config)).fetchone()
+            ids[(practice, config)] = row[0]
+        return ids
+    
+    def insert_session(self, results: List[BenchmarkResult], host_id: str = '',
+                       command: str = '', log_file: str = '',
+                       started: Optional[str] = None) -> Optional[int]:
+        """Insertar una sesión con todas sus corridas; devuelve el id de la sesión"""
+        # Las corridas reutilizadas de la caché ya se insertaron en la sesión que las midió
+        results = [r for r in results if not r.cached]
+        if not results:
+            return None
+        
+        hosts = load_hosts()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = datetime.datetime.now().isoformat()
+            self.conn.executemany(
+                "INSERT INTO hosts (host_id, fingerprint, first_seen) VALUES (?, ?, ?) "
+                "ON CONFLICT (host_id) DO UPDATE SET fingerprint = excluded.fingerprint "
+                "WHERE excluded.fingerprint != '{}'",
+                [(h, json.dumps(hosts.get(h, {}), sort_keys=True), now)
+                 for h in dict.fromkeys(r.host_id for r in results)])
+            
+            session_id = self.conn.execute(
+                "INSERT INTO sessions (started, harness_version, host_id, command, log_file) VALUES (?, ?, ?, ?, ?)",
+                (started or min(r.timestamp for r in results), HARNESS_VERSION, host_id, command, log_file)).lastrowid
+            
+            config_ids = self.config_ids(results)
+            # Ids explícitos: la transacción IMMEDIATE garantiza un único escritor
+            next_id = self.conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM runs").fetchone()[0]
+            
+            for start in range(0, len(results), DB_BATCH_ROWS):
+                batch = results[start:start + DB_BATCH_ROWS]
+                runs, metrics = [], []
+                for run_id, r in enumerate(batch, next_id + start):
+                    runs.append((run_id, session_id, config_ids[(r.practice, r.config)], r.host_id, r.timestamp,
+                                 r.execution_time, r.throughput, r.success, r.warmup, r.cached, r.outlier,
+                                 *(getattr(r, field) for field in RUSAGE_FIELDS), r.cpu_set, r.output_ref))
+                    metrics.extend((run_id, name, float(value)) for name, value in r.metrics.items()
+                                   if isinstance(value, (int, float)))
+                self.conn.executemany(
+                    f"INSERT INTO runs (id, session_id, config_id, host_id, timestamp, execution_time, throughput, "
+                    f"success, warmup, cached, outlier, {', '.join(RUSAGE_FIELDS)}, cpu_set, output_ref) "
+                    f"VALUES ({', '.join('?' * (13 + len(RUSAGE_FIELDS)))})", runs)
+                self.conn.executemany("INSERT INTO run_metrics (run_id, name, value) VALUES (?, ?, ?)", metrics)
+            
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        return session_id
+    
+    def import_csv(self, csv_file: Path) -> Tuple[int, int]:
+        """Importar un CSV de resultados como una sesión
+        
+        Devuelve (filas importadas, filas omitidas); ValueError si el esquema no es reconocido.
+        """
+        reader = CsvResultReader(csv_file)
+        results = [result for result in reader if not result.cached]
+        self.insert_session(results, command=f"import {csv_file}")
+        return len(results), reader.skipped
+    
+    def query(self, practice: Optional[str] = None, params: Optional[Dict[str, Any]] = None,
+              host: Optional[str] = None, since: Optional[str] = None, until: Optional[str] = None,
+              metric: str = 'execution_time', group_by: str = 'config', stats: Optional[List[str]] = None,
+              include_warmup: bool = False) -> List[Dict[str, Any]]:
+        """Agregados de una métrica por grupo
+        
+        stats admite count, mean, stdev, min, max, median y percentiles 'pNN'
+        (ej: p99, p99.9). Sin percentiles todo se agrega en SQL; con
+        percentiles se leen una sola vez los valores de cada grupo y todos
+        los agregados se calculan sobre esa lista ordenada. Las corridas
+        reutilizadas de la caché nunca se cuentan (son copias de otra sesión).
+        """
+        stats = stats or ['count', 'mean', 'p50', 'p99']
+        percentiles = {stat: percentile_fraction(stat) for stat in stats if stat not in DB_SIMPLE_STATS}
+        group_keys = {
+            'config': "c.practice || ' ' || c.config",
+            'practice': "c.practice",
+            'host': "r.host_id",
+            'day': "substr(r.timestamp, 1, 10)",
+            'session': "r.session_id",
+        }
+        
+        where, args = [], []
+        if metric in DB_RUN_COLUMNS:
+            value, join = f"r.{metric}", ""
+        else:
+            value, join = "m.value", "JOIN run_metrics m ON m.run_id = r.id AND m.name = ?"
+            args.append(metric)
+        if practice:
+            where.append("c.practice = ?")
+            args.append(practice)
+        for name, param in (params or {}).items():
+            where.append("json_extract(c.params, '$.' || ?) = ?")
+            args.extend([name, param])
+        if host:
+            where.append("r.host_id LIKE ?")
+            args.append(host + '%')
+        if since:
+            where.append("r.timestamp >= ?")
+            args.append(since)
+        if until:
+            where.append("r.timestamp < ?")
+            args.append(until)
+        if not include_warmup:
+            where.append("r.success = 1 AND r.warmup = 0")
+        where.append("r.cached = 0")
+        
+        base = (f"SELECT {group_keys[group_by]} AS grp, {value} AS v FROM runs r "
+                f"JOIN configs c ON c.id = r.config_id {join} "
+                f"WHERE v IS NOT NULL{''.join(' AND ' + w for w in where)}")
+        
+        rows = []
+        if not percentiles:
+            for grp, count, mean, low, high, mean_sq in self.conn.execute(
+                    f"SELECT grp, COUNT(v), AVG(v), MIN(v), MAX(v), AVG(v * v) FROM ({base}) GROUP BY grp ORDER BY grp",
+                    args):
+                stdev = (max(mean_sq - mean * mean, 0.0) * count / (count - 1)) ** 0.5 if count > 1 else 0.0
+                summary = {'count': count, 'mean': mean, 'stdev': stdev, 'min': low, 'max': high}
+                rows.append({'group': grp, **{stat: summary[stat] for stat in stats}})
+            return rows
+        
+        # Una sola lectura: se agrupa y ordena en Python (más rápido que el ORDER BY con B-tree temporal)
+        groups: Dict[Any, List[float]] = {}
+        for grp, v in self.conn.execute(base, args):
+            groups.setdefault(grp, []).append(v)
+        
+        for grp in sorted(groups):
+            values = sorted(groups[grp])
+            summary = {
+                'count': len(values),
+                'mean': statistics.fmean(values),
+                'stdev': statistics.stdev(values) if len(values) > 1 else 0.0,
+                'min': values[0],
+                'max': values[-1],
+                **{stat: quantile(values, q) for stat, q in percentiles.items()}
+            }
+            rows.append({'group': grp, **{stat: summary[stat] for stat in stats}})
+        return rows
+
+# ============================================================================
+# PARTICIONADO DE CPUS
 # ============================================================================
 
-@dataclass
-class BenchmarkResult:
-    """Resultado de una ejecución de benchmark"""
-    practice: str
-    config: str
-    timestamp: str
-    execution_time: float
-    throughput: float
-    success: bool
-    stdout: str = ""
-    stderr: str = ""
-    metrics: Dict[str, Any] = None
+def available_cpus() -> List[int]:
+    """CPUs en los que este proceso tiene permitido ejecutar"""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+def format_cpu_set(cpus: List[int]) -> str:
+    """Formatear lista de CPUs en notación compacta (ej: '0-3,8')"""
+    ranges = []
+    for cpu in sorted(cpus):
+        if ranges and cpu == ranges[-1][1] + 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ','.join(f"{a}-{b}" if a != b else str(a) for a, b in ranges)
+
+class CpuPartitioner:
+    """Reparte los cores físicos de la máquina en conjuntos disjuntos para ejecuciones concurrentes
     
-    def __post_init__(self):
-        if self.metrics is None:
-            self.metrics = {}
+    La unidad de reparto es el core físico con todos sus hermanos SMT, así dos
+    particiones nunca comparten core. Se pide un core por hilo (acotado al
+    total) y se prefiere un único socket cuando la partición cabe en uno.
+    
+    Las esperas se atienden en orden de llegada: una petición grande no queda
+    postergada indefinidamente por peticiones chicas que llegan después.
+    """
+    
+    def __init__(self, cpus: Optional[List[int]] = None,
+                 core_map: Optional[Dict[int, Tuple[int, int]]] = None):
+        self.cpus = list(cpus) if cpus else available_cpus()
+        core_map = core_map if core_map is not None else cpu_core_map()
+        
+        # (socket, core) -> CPUs lógicos permitidos; sin topología cada CPU es su propio core
+        self.cores: Dict[Tuple[int, int], List[int]] = {}
+        for cpu in self.cpus:
+            self.cores.setdefault(core_map.get(cpu, (-1, cpu)), []).append(cpu)
+        self.free = sorted(self.cores)
+        # Cola FIFO de (cores pedidos, future que recibe la partición asignada)
+        self.waiters: Deque[Tuple[int, asyncio.Future]] = deque()
+    
+    def pick_cores(self, count: int) -> List[Tuple[int, int]]:
+        """Elegir `count` cores libres, dentro de un socket si alguno tiene suficientes"""
+        by_socket: Dict[int, List[Tuple[int, int]]] = {}
+        for core in self.free:
+            by_socket.setdefault(core[0], []).append(core)
+        
+        fitting = [cores for cores in by_socket.values() if len(cores) >= count]
+        if fitting:
+            # El socket más ocupado que alcance deja sockets enteros para particiones grandes
+            return min(fitting, key=len)[:count]
+        
+        picked: List[Tuple[int, int]] = []
+        for cores in sorted(by_socket.values(), key=len, reverse=True):
+            picked.extend(cores[:count - len(picked)])
+        return picked
+    
+    async def acquire(self, count: int) -> List[int]:
+        """Esperar hasta obtener cores físicos para `count` hilos (acotado al total)
+        
+        Devuelve los CPUs lógicos de los cores asignados, incluidos sus hermanos SMT.
+        """
+        count = max(1, min(count, len(self.cores)))
+        if not self.waiters and len(self.free) >= count:
+            return self.grant(count)
+        
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (count, waiter)
+        self.waiters.append(entry)
+        try:
+            return await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Cancelada tras recibir la partición: se devuelve
+                self.release(waiter.result())
+            else:
+                if entry in self.waiters:
+                    self.waiters.remove(entry)
+                self.wake_waiters()
+            raise
+    
+    def grant(self, count: int) -> List[int]:
+        """Reservar `count` cores libres y devolver sus CPUs lógicos"""
+        picked = self.pick_cores(count)
+        self.free = [core for core in self.free if core not in picked]
+        return sorted(cpu for core in picked for cpu in self.cores[core])
+    
+    def wake_waiters(self):
+        """Asignar cores a la cabeza de la cola mientras alcancen (sin adelantar a nadie)"""
+        while self.waiters:
+            count, waiter = self.waiters[0]
+            if waiter.done():
+                self.waiters.popleft()
+            elif len(self.free) >= count:
+                self.waiters.popleft()
+                waiter.set_result(self.grant(count))
+            else:
+                break
+    
+    def release(self, partition: List[int]):
+        """Devolver una partición al conjunto libre y atender a quienes esperan"""
+        released = {core for core, cpus in self.cores.items() if cpus[0] in partition}
+        self.free = sorted(set(self.free) | released)
+        self.wake_waiters()
 
-@dataclass
-class BenchmarkSuite:
-    """Suite completa de benchmarks para una práctica"""
-    practice: str
-    name: str
-    results: List[BenchmarkResult]
-    statistics: Dict[str, Any] = None
+# ============================================================================
+# ESPERA DE REPOSO ENTRE REPETICIONES
+# ============================================================================
+
+class QuiescenceGate:
+    """Espera a que el sistema vuelva a su línea base de reposo antes de la siguiente corrida
     
-    def __post_init__(self):
-        if self.statistics is None:
-            self.statistics = {}
+    Compara la ocupación de los CPUs (/proc/stat), los procesos ejecutables
+    (/proc/loadavg) y, si existe, la frecuencia de cpufreq contra una línea base
+    medida al inicio de la sesión. Sin /proc se usa la pausa fija original.
+    """
+    
+    def __init__(self, max_wait: float = QUIESCENCE_MAX_WAIT):
+        self.max_wait = max_wait
+        self.available = Path('/proc/stat').exists() and Path('/proc/loadavg').exists()
+        self.calibration: Optional[asyncio.Future] = None
+        self.baseline_busy: Dict[int, float] = {}
+        self.baseline_running = 1
+        self.baseline_freq: Optional[float] = None
+    
+    def read_cpu_times(self) -> Dict[int, Tuple[int, int]]:
+        """Leer (tiempo ocupado, tiempo total) en jiffies por CPU"""
+        cpu_times = {}
+        with open('/proc/stat', 'r') as f:
+            for line in f:
+                if not line.startswith('cpu') or line.startswith('cpu '):
+                    continue
+                fields = line.split()
+                values = [int(v) for v in fields[1:9]]
+                idle = values[3] + values[4]  # idle + iowait
+                total = sum(values)
+                cpu_times[int(fields[0][3:])] = (total - idle, total)
+        return cpu_times
+    
+    def read_running(self) -> int:
+        """Procesos ejecutables según /proc/loadavg (campo 'ejecutables/total')"""
+        with open('/proc/loadavg', 'r') as f:
+            return int(f.read().split()[3].split('/')[0])
+    
+    def read_frequency(self, cpus: List[int]) -> Optional[float]:
+        """Frecuencia promedio actual (kHz) de los CPUs indicados, si cpufreq está disponible"""
+        frequencies = []
+        for cpu in cpus:
+            freq_file = Path(f"/sys/devices/system/cpu/cpu{cpu}/cpufreq/scaling_cur_freq")
+            try:
+                frequencies.append(int(freq_file.read_text().strip()))
+            except (OSError, ValueError):
+                continue
+        return statistics.mean(frequencies) if frequencies else None
+    
+    async def sample_busy(self, cpus: List[int]) -> Dict[int, float]:
+        """Fracción de tiempo ocupado de cada CPU durante un intervalo de muestreo"""
+        before = self.read_cpu_times()
+        await asyncio.sleep(QUIESCENCE_SAMPLE_INTERVAL)
+        after = self.read_cpu_times()
+        
+        busy = {}
+        for cpu in cpus:
+            if cpu in before and cpu in after:
+                delta_total = after[cpu][1] - before[cpu][1]
+                delta_busy = after[cpu][0] - before[cpu][0]
+                busy[cpu] = delta_busy / delta_total if delta_total > 0 else 0.0
+        return busy
+    
+    async def ensure_calibrated(self):
+        """Medir la línea base de reposo una sola vez por sesión"""
+        if not self.available:
+            return
+        if self.calibration is None:
+            self.calibration = asyncio.ensure_future(self.calibrate())
+        await self.calibration
+    
+    async def calibrate(self):
+        """Tomar varias muestras con el sistema en reposo y quedarse con la mínima ocupación"""
+        cpus = available_cpus()
+        samples = [await self.sample_busy(cpus) for _ in range(4)]
+        self.baseline_busy = {cpu: min(sample.get(cpu, 0.0) for sample in samples) for cpu in cpus}
+        self.baseline_running = self.read_running()
+        self.baseline_freq = self.read_frequency(cpus)
+    
+    async def wait(self, cpus: Optional[List[int]] = None, check_running: bool = True) -> float:
+        """Esperar hasta que los CPUs indicados vuelvan a reposo (o se agote max_wait)
+        
+        Devuelve los segundos esperados. En modo paralelo se pasa
+        `check_running=False`, ya que otras particiones siguen ocupadas a propósito.
+        """
+        if not self.available:
+            await asyncio.sleep(FIXED_REPETITION_PAUSE)
+            return FIXED_REPETITION_PAUSE
+        
+        await self.ensure_calibrated()
+        cpus = cpus or available_cpus()
+        start = time.time()
+        
+        while True:
+            busy = await self.sample_busy(cpus)
+            idle = all(value <= self.baseline_busy.get(cpu, 0.0) + QUIESCENCE_BUSY_MARGIN
+                       for cpu, value in busy.items())
+            
+            if idle and check_running:
+                idle = self.read_running() <= self.baseline_running
+            
+            if idle and self.baseline_freq:
+                current_freq = self.read_frequency(cpus)
+                idle = current_freq is None or current_freq <= self.baseline_freq * (1 + QUIESCENCE_FREQ_MARGIN)
+            
+            waited = time.time() - start
+            if idle or waited >= self.max_wait:
+                return waited
 
 # ============================================================================
 # CLASE PRINCIPAL DE BENCHMARKING
@@ -160,9 +2361,36 @@ class BenchmarkSuite:
 class Lab06Benchmarker:
     """Sistema de benchmarking para el Laboratorio 6"""
     
-    def __init__(self, repetitions: int = DEFAULT_REPETITIONS, timeout: int = DEFAULT_TIMEOUT):
+    def __init__(self, repetitions: int = DEFAULT_REPETITIONS, timeout: int = DEFAULT_TIMEOUT,
+                 parallel: bool = False, adaptive: bool = False,
+                 target_ci: float = ADAPTIVE_TARGET_CI,
+                 max_repetitions: int = ADAPTIVE_MAX_REPETITIONS,
+                 time_budget: float = ADAPTIVE_TIME_BUDGET,
+                 warmup: int = WARMUP_ITERATIONS, warmup_tolerance: Optional[float] = None,
+                 cooldown_max: float = QUIESCENCE_MAX_WAIT, reuse: bool = False,
+                 resume: bool = False, sweeps: Optional[Dict[str, Dict[str, Any]]] = None,
+                 perf_events: Optional[List[str]] = None):
         self.repetitions = repetitions
         self.timeout = timeout
+        self.parallel = parallel
+        self.adaptive = adaptive
+        self.target_ci = target_ci
+        self.max_repetitions = max(max_repetitions, ADAPTIVE_MIN_REPETITIONS)
+        self.time_budget = time_budget
+        self.warmup = warmup
+        self.warmup_tolerance = warmup_tolerance
+        self.quiescence = QuiescenceGate(max_wait=cooldown_max)
+        self.reuse = reuse
+        # Fingerprint del host: se toma una vez por sesión y acompaña a cada resultado
+        self.host = host_fingerprint()
+        self.host_id = fingerprint_id(self.host)
+        self.cache = ResultCache(host_id=self.host_id)
+        self.perf = PerfStat(perf_events) if perf_events else None
+        self.resume = resume
+        self.journal = ResultJournal(JOURNAL_FILE, resume=resume)
+        self.sweeps = sweeps or {}
+        self.grids: Dict[str, List[Dict[str, Any]]] = {}
+        self.partitioner = CpuPartitioner() if parallel else None
         self.results: List[BenchmarkResult] = []
         self.suites: Dict[str, BenchmarkSuite] = {}
         
@@ -171,6 +2399,10 @@ class Lab06Benchmarker:
         
         # Configurar logging
         self.log_file = DATA_DIR / f"benchmark_log_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+        
+        if self.perf and not self.perf.available:
+            self.log("INFO", f"Contadores de hardware deshabilitados: {self.perf.reason}")
+            self.perf = None
     
     def log(self, level: str, message: str):
         """Logging con timestamp"""
@@ -214,52 +2446,172 @@ class Lab06Benchmarker:
         
         return True
     
-    def run_single_benchmark(self, practice: str, params: Dict[str, Any]) -> BenchmarkResult:
-        """Ejecutar un benchmark individual"""
+    def required_cpus(self, practice: str, params: Dict[str, Any]) -> int:
+        """Número de CPUs que necesita una configuración (hilos de trabajo simultáneos)"""
+        if practice in ('p1_counter', 'p3_rw', 'p4_deadlock'):
+            return int(params.get('threads', 1))
+        elif practice == 'p2_ring':
+            # p2_ring ejecuta también 2P/1C y 1P/2C antes de la configuración pedida
+            return max(3, int(params['producers']) + int(params['consumers']))
+        elif practice == 'p5_pipeline':
+            # Tres etapas, un hilo por etapa
+            return 3
+        return 1
+    
+    def build_command(self, practice: str, params: Dict[str, Any]) -> List[str]:
+        """Construir argv del ejecutable para una configuración"""
         config = PRACTICE_CONFIGS[practice]
         executable_path = BIN_DIR / config['executable']
         
         # Construir comando
         cmd_parts = [str(executable_path)]
         
-        # Agregar parámetros específicos por práctica
-        if practice == 'p1_counter':
-            cmd_parts.extend([str(params['threads']), str(params['iterations'])])
-        elif practice == 'p2_ring':
-            cmd_parts.extend([str(params['producers']), str(params['consumers']), str(params['items'])])
-        elif practice == 'p3_rw':
-            cmd_parts.extend([str(params['threads']), str(params['operations'])])
-        elif practice == 'p4_deadlock':
-            cmd_parts.extend([str(params['threads']), str(params.get('skip_demo', 1))])
-        elif practice == 'p5_pipeline':
-            cmd_parts.append(str(params['ticks']))
+        # Argumentos posicionales en el orden que espera el binario
+        defaults = config.get('defaults', {})
+        cmd_parts.extend(str(params.get(name, defaults.get(name))) for name in config['args'])
+        
+        return cmd_parts
+    
+    def config_grid(self, practice: str) -> List[Dict[str, Any]]:
+        """Configuraciones a ejecutar: el barrido de --sweep o el barrido por defecto"""
+        spec = self.sweeps.get(practice, PRACTICE_CONFIGS[practice]['sweep'])
+        grid = expand_sweep(practice, spec)
+        self.grids[practice] = grid
+        return grid
+    
+    def run_single_benchmark(self, practice: str, params: Dict[str, Any],
+                             cpus: Optional[List[int]] = None) -> BenchmarkResult:
+        """Ejecutar un benchmark individual (opcionalmente fijado a una partición de CPUs)"""
+        return asyncio.run(self.run_benchmark_async(practice, params, cpus))
+    
+    async def read_stream_lines(self, stream: asyncio.StreamReader, spool: OutputSpool,
+                                extractor: MetricExtractor):
+        """Consumir un pipe línea por línea a medida que el proceso escribe"""
+        async for raw_line in stream:
+            line = raw_line.decode('utf-8', errors='replace')
+            spool.write(line)
+            extractor.feed(line)
+    
+    async def open_pipe_reader(self, pipe) -> Tuple[asyncio.StreamReader, asyncio.BaseTransport]:
+        """Conectar un pipe del hijo al event loop como StreamReader"""
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader(limit=STREAM_LINE_LIMIT)
+        transport, _ = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), pipe)
+        return reader, transport
+    
+    async def wait_child(self, process: subprocess.Popen) -> Tuple[int, Any]:
+        """Esperar al hijo y recolectarlo con os.wait4 para obtener su rusage exacto
+        
+        Devuelve (instante de terminación en ns de perf_counter, rusage). Se usa
+        pidfd para no bloquear el event loop; en kernels sin pidfd se espera en el
+        pool de hilos por defecto.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            pidfd = os.pidfd_open(process.pid)
+        except (AttributeError, OSError):
+            pidfd = None
+        
+        if pidfd is not None:
+            exited = loop.create_future()
+            loop.add_reader(pidfd, lambda: exited.done() or exited.set_result(None))
+            try:
+                await exited
+            finally:
+                loop.remove_reader(pidfd)
+                os.close(pidfd)
+            end_ns = time.perf_counter_ns()
+            _, status, rusage = os.wait4(process.pid, 0)
+        else:
+            _, status, rusage = await loop.run_in_executor(None, os.wait4, process.pid, 0)
+            end_ns = time.perf_counter_ns()
+        
+        process.returncode = os.waitstatus_to_exitcode(status)
+        return end_ns, rusage
+    
+    async def run_benchmark_async(self, practice: str, params: Dict[str, Any],
+                                  cpus: Optional[List[int]] = None) -> BenchmarkResult:
+        """Ejecutar un benchmark individual sin bloquear el event loop"""
+        config = PRACTICE_CONFIGS[practice]
+        cmd_parts = self.build_command(practice, params)
         
         cmd = ' '.join(cmd_parts)
-        config_str = '_'.join(f"{k}={v}" for k, v in params.items())
+        config_str = config_string(params)
+        cpu_set = format_cpu_set(cpus) if cpus else ""
+        output_ref = raw_output_ref(practice, config_str)
+        
+        self.log("INFO", f"Ejecutando: {cmd}" + (f" [CPUs {cpu_set}]" if cpu_set else ""))
+        
+        # Con --perf-counters el hijo es perf stat (el tiempo incluye su arranque)
+        perf_file = RAW_OUTPUT_DIR / f"{output_ref}.perf.csv"
+        if self.perf:
+            cmd_parts = self.perf.wrap(cmd_parts, perf_file)
+        
+        # Fijar afinidad en el hijo antes del exec para que sus hilos la hereden
+        preexec = (lambda: os.sched_setaffinity(0, cpus)) if cpus else None
         
-        self.log("INFO", f"Ejecutando: {cmd}")
+        stdout_spool = OutputSpool(RAW_OUTPUT_DIR / f"{output_ref}.stdout.gz")
+        stderr_spool = OutputSpool(RAW_OUTPUT_DIR / f"{output_ref}.stderr.gz")
+        extractor = MetricExtractor(practice)
+        process = None
+        wait_task = None
+        transports = []
         
         try:
             # Ejecutar comando con timeout
-            start_time = time.time()
-            process = subprocess.run(
+            start_ns = time.perf_counter_ns()
+            process = subprocess.Popen(
                 cmd_parts,
-                timeout=config['timeout'],
-                capture_output=True,
-                text=True,
-                cwd='.'
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                cwd='.',
+                preexec_fn=preexec
             )
-            end_time = time.time()
+            wait_task = asyncio.ensure_future(self.wait_child(process))
+            stdout_reader, stdout_transport = await self.open_pipe_reader(process.stdout)
+            stderr_reader, stderr_transport = await self.open_pipe_reader(process.stderr)
+            transports = [stdout_transport, stderr_transport]
             
-            execution_time = end_time - start_time
+            # Leer ambos pipes en paralelo para que ninguno se llene y bloquee al hijo
+            await asyncio.wait_for(
+                asyncio.gather(
+                    self.read_stream_lines(stdout_reader, stdout_spool, extractor),
+                    self.read_stream_lines(stderr_reader, stderr_spool, extractor),
+                    asyncio.shield(wait_task)
+                ),
+                timeout=config['timeout']
+            )
+            end_ns, rusage = wait_task.result()
+            
+            execution_time = (end_ns - start_ns) / 1e9
             success = process.returncode == 0
             
-            # Extraer métricas del output
-            metrics = self.parse_output(practice, process.stdout, process.stderr)
+            # Métricas ya extraídas mientras se leía el output
+            try:
+                metrics = extractor.metrics()
+            except Exception as e:
+                self.log("DEBUG", f"Error parseando output: {e}")
+                metrics = {}
+            
+            # Log por item que escribe el binario (p5_pipeline); el análisis de logs de
+            # varios GB corre en un hilo para no frenar la lectura de pipes de otras ejecuciones
+            if success and 'log_file' in config and Path(config['log_file']).exists():
+                try:
+                    summary = await asyncio.get_running_loop().run_in_executor(
+                        None, PipelineLogAnalyzer(Path(config['log_file'])).analyze)
+                    metrics.update(pipeline_log_metrics(summary))
+                except (OSError, ValueError) as e:
+                    self.log("DEBUG", f"Error analizando {config['log_file']}: {e}")
             
             # Calcular throughput
             throughput = self.calculate_throughput(practice, params, execution_time, metrics)
             
+            if self.perf:
+                counters = PerfStat.parse(perf_file)
+                metrics.update(counters)
+                metrics.update(PerfStat.derived(counters, throughput * execution_time))
+            
             result = BenchmarkResult(
                 practice=practice,
                 config=config_str,
@@ -267,9 +2619,13 @@ class Lab06Benchmarker:
                 execution_time=execution_time,
                 throughput=throughput,
                 success=success,
-                stdout=process.stdout,
-                stderr=process.stderr,
-                metrics=metrics
+                stdout=stdout_spool.text(),
+                stderr=stderr_spool.text(),
+                metrics=metrics,
+                cpu_set=cpu_set,
+                output_ref=output_ref,
+                host_id=self.host_id,
+                **rusage_fields(rusage)
             )
             
             if success:
@@ -279,8 +2635,9 @@ class Lab06Benchmarker:
             
             return result
             
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
             self.log("WARN", f"Benchmark timeout después de {config['timeout']}s")
+            usage = await self.kill_process(process, wait_task)
             return BenchmarkResult(
                 practice=practice,
                 config=config_str,
@@ -288,11 +2645,18 @@ class Lab06Benchmarker:
                 execution_time=config['timeout'],
                 throughput=0.0,
                 success=False,
-                stderr="Timeout expired"
+                stdout=stdout_spool.text(),
+                stderr="Timeout expired",
+                cpu_set=cpu_set,
+                output_ref=output_ref,
+                host_id=self.host_id,
+                **(rusage_fields(usage[1]) if usage else {})
             )
         
         except Exception as e:
             self.log("ERROR", f"Error ejecutando benchmark: {e}")
+            usage = await self.kill_process(process, wait_task)
+            # La salida capturada hasta el error queda en los spools referenciados
             return BenchmarkResult(
                 practice=practice,
                 config=config_str,
@@ -300,221 +2664,846 @@ class Lab06Benchmarker:
                 execution_time=0.0,
                 throughput=0.0,
                 success=False,
-                stderr=str(e)
+                stdout=stdout_spool.text(),
+                stderr=str(e),
+                cpu_set=cpu_set,
+                output_ref=output_ref,
+                host_id=self.host_id,
+                **(rusage_fields(usage[1]) if usage else {})
             )
+        
+        finally:
+            for transport in transports:
+                transport.close()
+            stdout_spool.close()
+            stderr_spool.close()
+    
+    async def kill_process(self, process: Optional[subprocess.Popen],
+                           wait_task: Optional[asyncio.Future]) -> Optional[Tuple[int, Any]]:
+        """Terminar un proceso hijo que sigue vivo y recolectar su estado"""
+        if process is None:
+            return None
+        if process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+        if wait_task is None:
+            process.wait()
+            return None
+        return await wait_task
     
     def parse_output(self, practice: str, stdout: str, stderr: str) -> Dict[str, Any]:
         """Parsear output del programa para extraer métricas"""
-        metrics = {}
+        extractor = MetricExtractor(practice)
+        
+        try:
+            extractor.feed(stdout)
+            extractor.feed(stderr)
+            return extractor.metrics()
+        except Exception as e:
+            self.log("DEBUG", f"Error parseando output: {e}")
+        
+        return {}
+    
+    def calculate_throughput(self, practice: str, params: Dict[str, Any], 
+                           execution_time: float, metrics: Dict[str, Any]) -> float:
+        """Calcular throughput en operaciones por segundo"""
+        if execution_time <= 0:
+            return 0.0
         
         try:
-            # Patrones comunes de extracción
-            patterns = {
-                'time': r'Tiempo[:\s]+([0-9.]+)',
-                'throughput': r'Throughput[:\s]+([0-9.]+)',
-                'operations': r'operaciones[:\s]+([0-9]+)',
-                'items_produced': r'producidos[:\s]+([0-9]+)',
-                'items_consumed': r'consumidos[:\s]+([0-9]+)',
-                'speedup': r'Speedup[:\s]+([0-9.]+)',
-                'latency': r'latencia[:\s]+([0-9.]+)',
-                'efficiency': r'eficiencia[:\s]+([0-9.]+)',
-            }
-            
-            combined_output = stdout + '\n' + stderr
-            
-            for metric_name, pattern in patterns.items():
-                matches = re.findall(pattern, combined_output, re.IGNORECASE)
-                if matches:
-                    try:
-                        # Tomar el último valor encontrado
-                        value = float(matches[-1])
-                        metrics[metric_name] = value
-                    except ValueError:
-                        pass
-            
-            # Métricas específicas por práctica
             if practice == 'p1_counter':
-                # Buscar resultado vs esperado
-                result_match = re.search(r'Resultado:\s*(\d+).*esperado:\s*(\d+)', combined_output)
-                if result_match:
-                    actual, expected = map(int, result_match.groups())
-                    metrics['correctness'] = 1.0 if actual == expected else actual / expected
+                total_ops = params['threads'] * params['iterations']
+                return total_ops / execution_time
             
             elif practice == 'p2_ring':
-                # Buscar estadísticas de productor/consumidor
-                prod_match = re.search(r'producidos:\s*(\d+)', combined_output)
-                cons_match = re.search(r'consumidos:\s*(\d+)', combined_output)
-                if prod_match and cons_match:
-                    produced = int(prod_match.group(1))
-                    consumed = int(cons_match.group(1))
-                    if produced > 0:
-                        metrics['efficiency'] = consumed / produced
+                total_items = params['producers'] * params['items']
+                return total_items / execution_time
             
             elif practice == 'p3_rw':
-                # Buscar proporción de lecturas/escrituras
-                read_match = re.search(r'R:\s*(\d+)', combined_output)
-                write_match = re.search(r'W:\s*(\d+)', combined_output)
-                if read_match and write_match:
-                    reads = int(read_match.group(1))
-                    writes = int(write_match.group(1))
-                    total = reads + writes
-                    if total > 0:
-                        metrics['read_ratio'] = reads / total
-                        metrics['write_ratio'] = writes / total
+                total_ops = params['threads'] * params['operations']
+                return total_ops / execution_time
+            
+            elif practice == 'p4_deadlock':
+                # Para deadlock, throughput no es tan relevante
+                return 1.0 / execution_time if execution_time > 0 else 0.0
             
             elif practice == 'p5_pipeline':
-                # Buscar estadísticas del pipeline
-                filtered_match = re.search(r'filtrados:\s*(\d+)', combined_output)
-                generated_match = re.search(r'generados:\s*(\d+)', combined_output)
-                if filtered_match and generated_match:
-                    filtered = int(filtered_match.group(1))
-                    generated = int(generated_match.group(1))
-                    if generated > 0:
-                        metrics['filter_efficiency'] = filtered / generated
+                # Para pipeline, usar ticks procesados
+                return params['ticks'] / execution_time
+            
+        except Exception as e:
+            self.log("DEBUG", f"Error calculando throughput: {e}")
+        
+        return 0.0
+    
+    def run_practice_suite(self, practice: str) -> BenchmarkSuite:
+        """Ejecutar suite completa de benchmarks para una práctica"""
+        return asyncio.run(self.run_practice_suite_async(practice))
+    
+    def run_params(self, practice: str, param_set: Dict[str, Any]) -> List[BenchmarkResult]:
+        """Ejecutar una configuración explícita (--params) con warm-ups, journal y caché"""
+        return asyncio.run(self.run_params_async(practice, param_set))
+    
+    async def run_params_async(self, practice: str, param_set: Dict[str, Any]) -> List[BenchmarkResult]:
+        """Ejecutar una configuración explícita dentro del event loop"""
+        if not self.check_executable(practice):
+            raise RuntimeError(f"Ejecutable no disponible para práctica {practice}")
+        
+        await self.quiescence.ensure_calibrated()
+        results = await self.execute_config(practice, param_set)
+        self.cache.save()
+        return results
+    
+    def optimize_threads(self, practice: str, max_threads: Optional[int] = None) -> BenchmarkSuite:
+        """Buscar el número de hilos óptimo para una práctica (--optimize threads)"""
+        return asyncio.run(self.optimize_threads_async(practice, max_threads))
+    
+    def run_suites(self, practices: List[str]) -> Dict[str, BenchmarkSuite]:
+        """Ejecutar varias suites; en modo paralelo se solapan entre sí"""
+        return asyncio.run(self.run_suites_async(practices))
+    
+    async def run_suites_async(self, practices: List[str]) -> Dict[str, BenchmarkSuite]:
+        """Ejecutar varias suites registrando los errores de cada práctica sin abortar el resto"""
+        if self.parallel:
+            outcomes = await asyncio.gather(
+                *(self.run_practice_suite_async(practice) for practice in practices),
+                return_exceptions=True
+            )
+        else:
+            outcomes = []
+            for practice in practices:
+                try:
+                    outcomes.append(await self.run_practice_suite_async(practice))
+                except Exception as e:
+                    outcomes.append(e)
+        
+        suites = {}
+        for practice, outcome in zip(practices, outcomes):
+            if isinstance(outcome, Exception):
+                self.log("ERROR", f"Error en práctica {practice}: {outcome}")
+            else:
+                suites[practice] = outcome
+        return suites
+    
+    async def run_practice_suite_async(self, practice: str) -> BenchmarkSuite:
+        """Ejecutar suite completa de benchmarks para una práctica dentro del event loop"""
+        if practice not in PRACTICE_CONFIGS:
+            raise ValueError(f"Práctica desconocida: {practice}")
+        
+        if not self.check_executable(practice):
+            raise RuntimeError(f"Ejecutable no disponible para práctica {practice}")
+        
+        config = PRACTICE_CONFIGS[practice]
+        grid = self.config_grid(practice)
+        self.log("INFO", f"Iniciando suite de benchmarks: {config['name']} ({len(grid)} configuraciones)")
+        
+        # Línea base de reposo antes de lanzar la primera corrida
+        await self.quiescence.ensure_calibrated()
+        
+        if self.parallel and not config.get('exclusive', False):
+            # Configuraciones independientes en paralelo, cada una en su partición
+            config_results = await asyncio.gather(
+                *(self.execute_config(practice, param_set) for param_set in grid)
+            )
+        else:
+            # En serie (en modo paralelo se solapan igual con otras prácticas)
+            config_results = [await self.execute_config(practice, param_set)
+                              for param_set in grid]
+        
+        self.cache.save()
+        
+        suite_results = [result for results in config_results for result in results]
+        
+        # Crear suite con estadísticas
+        suite = BenchmarkSuite(
+            practice=practice,
+            name=config['name'],
+            results=suite_results
+        )
+        
+        suite.statistics = self.calculate_suite_statistics(suite)
+        if 'threads' in config['args']:
+            suite.statistics['scalability'] = self.calculate_scaling_statistics(suite)
+        if practice == 'p1_counter':
+            suite.statistics['strategies'] = self.calculate_strategy_statistics(suite)
+        elif practice == 'p3_rw':
+            suite.statistics['rw_matrix'] = self.calculate_rw_matrix_statistics(suite)
+        elif practice == 'p2_ring':
+            suite.statistics['topologies'] = self.calculate_ring_statistics(suite)
+        latency = self.calculate_latency_statistics(suite)
+        if latency:
+            suite.statistics['latency'] = latency
+        if self.adaptive:
+            suite.statistics['adaptive'] = self.calculate_adaptive_statistics(suite)
+        
+        self.suites[practice] = suite
+        self.log("SUCCESS", f"Suite {config['name']} completada con {len(suite_results)} resultados")
+        
+        return suite
+    
+    async def optimize_threads_async(self, practice: str, max_threads: Optional[int] = None) -> BenchmarkSuite:
+        """Buscar el número de hilos que maximiza el throughput
+        
+        Búsqueda de sección áurea sobre enteros en 1..nproc, asumiendo una curva
+        unimodal. Cada sonda usa repeticiones adaptativas; si los IC de las dos
+        sondas interiores se solapan se consideran empatadas y el intervalo se
+        cierra por ambos lados en lugar de elegir un lado por ruido.
+        """
+        config = PRACTICE_CONFIGS[practice]
+        if 'threads' not in config['args']:
+            raise ValueError(f"{practice} no recibe 'threads' como argumento")
+        if not self.check_executable(practice):
+            raise RuntimeError(f"Ejecutable no disponible para práctica {practice}")
+        
+        # El resto de los parámetros se fija en la primera configuración del barrido
+        base = expand_sweep(practice, self.sweeps.get(practice, config['sweep']))[0]
+        low, high = 1, max(1, max_threads or len(available_cpus()))
+        self.log("INFO", f"Buscando threads óptimo para {config['name']} en [{low}, {high}]")
+        
+        await self.quiescence.ensure_calibrated()
+        
+        probes: Dict[int, Dict[str, Any]] = {}
+        suite_results: List[BenchmarkResult] = []
+        
+        async def probe(threads: int) -> Dict[str, Any]:
+            if threads not in probes:
+                params = {**base, 'threads': threads}
+                runs = await self.execute_config(practice, params)
+                suite_results.extend(runs)
+                throughputs = [r.throughput for r in measured_runs(runs) if r.success]
+                mean = statistics.mean(throughputs) if throughputs else 0.0
+                ci = relative_ci_half_width(throughputs)
+                probes[threads] = {
+                    'threads': threads,
+                    'params': params,
+                    'throughput': mean,
+                    'ci_half_width': mean * ci if ci != float('inf') else None,
+                    'repetitions': len(throughputs)
+                }
+                self.log("INFO", f"threads={threads}: {mean:.2f} ops/s")
+            return probes[threads]
+        
+        def compare(p: Dict[str, Any], q: Dict[str, Any]) -> int:
+            """1 si p es mejor que q, -1 si es peor, 0 si sus IC se solapan"""
+            if p['ci_half_width'] is None or q['ci_half_width'] is None:
+                margin = float('inf')
+            else:
+                margin = p['ci_half_width'] + q['ci_half_width']
+            diff = p['throughput'] - q['throughput']
+            if abs(diff) <= margin:
+                return 0
+            return 1 if diff > 0 else -1
+        
+        a, b = low, high
+        while b - a > 2:
+            c = a + round((b - a) * (1 - 1 / GOLDEN_RATIO))
+            d = max(c + 1, a + round((b - a) / GOLDEN_RATIO))
+            outcome = compare(await probe(c), await probe(d))
+            if outcome < 0:
+                a = c
+            elif outcome > 0:
+                b = d
+            else:
+                a, b = c, d
+        
+        for threads in range(a, b + 1):
+            await probe(threads)
+        
+        self.cache.save()
+        
+        best = max(probes.values(), key=lambda p: p['throughput'])
+        equivalent = min(n for n, p in probes.items() if compare(p, best) == 0)
+        curve = [{k: v for k, v in p.items() if k != 'params'} for _, p in sorted(probes.items())]
+        
+        self.log("SUCCESS", f"Óptimo: threads={best['threads']} ({best['throughput']:.2f} ops/s) "
+                            f"tras {len(probes)} sondas y {len(measured_runs(suite_results))} corridas")
+        if equivalent != best['threads']:
+            self.log("INFO", f"threads={equivalent} es estadísticamente equivalente con menos hilos")
+        
+        self.grids[practice] = [p['params'] for _, p in sorted(probes.items())]
+        suite = BenchmarkSuite(practice=practice, name=config['name'], results=suite_results)
+        suite.statistics = self.calculate_suite_statistics(suite)
+        suite.statistics['scalability'] = self.calculate_scaling_statistics(suite)
+        if practice == 'p1_counter':
+            suite.statistics['strategies'] = self.calculate_strategy_statistics(suite)
+        elif practice == 'p3_rw':
+            suite.statistics['rw_matrix'] = self.calculate_rw_matrix_statistics(suite)
+        elif practice == 'p2_ring':
+            suite.statistics['topologies'] = self.calculate_ring_statistics(suite)
+        suite.statistics['adaptive'] = self.calculate_adaptive_statistics(suite)
+        suite.statistics['optimization'] = {
+            'dimension': 'threads',
+            'range': [low, high],
+            'fixed_params': {k: v for k, v in base.items() if k != 'threads'},
+            'best_threads': best['threads'],
+            'best_throughput': best['throughput'],
+            'smallest_equivalent_threads': equivalent,
+            'probes': len(probes),
+            'total_runs': len(measured_runs(suite_results)),
+            'curve': curve
+        }
+        
+        self.suites[practice] = suite
+        return suite
+    
+    async def execute_config(self, practice: str, param_set: Dict[str, Any]) -> List[BenchmarkResult]:
+        """Ejecutar una configuración, o servirla desde la caché con --reuse"""
+        cache_key = self.cache.key(practice, param_set, self.perf.events if self.perf else None)
+        
+        if self.reuse:
+            needed = ADAPTIVE_MIN_REPETITIONS if self.adaptive else self.repetitions
+            cached = self.cache.lookup(cache_key, needed)
+            if cached is not None:
+                self.log("INFO", f"Configuración {param_set} servida desde caché ({len(cached)} repeticiones)")
+                for rep, result in enumerate(cached):
+                    self.journal.record(result, rep)
+                return cached
+        
+        if self.parallel:
+            results = await self.run_config_pinned(practice, param_set)
+        else:
+            results = await self.run_config(practice, param_set)
+        
+        self.cache.store(cache_key, results)
+        return results
+    
+    async def run_config_pinned(self, practice: str, param_set: Dict[str, Any]) -> List[BenchmarkResult]:
+        """Ejecutar una configuración en una partición de CPUs exclusiva"""
+        partition = await self.partitioner.acquire(self.required_cpus(practice, param_set))
+        try:
+            return await self.run_config(practice, param_set, partition)
+        finally:
+            self.partitioner.release(partition)
+    
+    async def run_config(self, practice: str, param_set: Dict[str, Any],
+                         cpus: Optional[List[int]] = None) -> List[BenchmarkResult]:
+        """Ejecutar todas las repeticiones de una configuración"""
+        self.log("INFO", f"Configuración: {param_set}")
+        
+        # Con --resume se parte de las repeticiones ya registradas en el journal
+        repetition_results = self.journal.completed_runs(practice, config_string(param_set)) if self.resume else []
+        if repetition_results:
+            self.log("INFO", f"Reanudando: {len(repetition_results)} repeticiones ya registradas en el journal")
+        
+        warmup_results = []
+        if not self.repetitions_complete(repetition_results, 0.0):
+            # Calentamiento: page cache, carga del binario y rampa de frecuencia del CPU
+            warmup_results = await self.run_warmups(practice, param_set, cpus)
+            
+            # Ejecutar múltiples repeticiones
+            config_start = time.time()
+            
+            while True:
+                rep = len(repetition_results)
+                planned = self.max_repetitions if self.adaptive else self.repetitions
+                self.log("DEBUG", f"Repetición {rep + 1}/{planned}")
+                
+                result = await self.run_benchmark_async(practice, param_set, cpus)
+                self.journal.record(result, rep)
+                repetition_results.append(result)
+                
+                stop_reason = self.repetitions_complete(repetition_results, time.time() - config_start)
+                if stop_reason:
+                    if self.adaptive:
+                        self.log("DEBUG", f"Repeticiones adaptativas detenidas tras {rep + 1}: {stop_reason}")
+                    break
+                
+                # Esperar reposo entre repeticiones
+                await self.cooldown(cpus)
+        
+        # Calcular estadísticas para esta configuración
+        successful_results = [r for r in repetition_results if r.success]
+        if successful_results:
+            times = [r.execution_time for r in successful_results]
+            
+            self.log("SUCCESS", 
+                f"Config completada - Tiempo promedio: {statistics.mean(times):.3f}s ± {statistics.stdev(times) if len(times) > 1 else 0:.3f}s")
+        
+        return warmup_results + repetition_results
+    
+    async def cooldown(self, cpus: Optional[List[int]] = None):
+        """Esperar a que la máquina (o la partición) vuelva a reposo antes de la siguiente corrida"""
+        if self.quiescence.max_wait <= 0:
+            return
+        waited = await self.quiescence.wait(cpus, check_running=not self.parallel)
+        self.log("DEBUG", f"Reposo alcanzado tras {waited:.2f}s")
+    
+    async def run_warmups(self, practice: str, param_set: Dict[str, Any],
+                          cpus: Optional[List[int]] = None) -> List[BenchmarkResult]:
+        """Ejecutar las corridas de calentamiento de una configuración
+        
+        Se ejecutan hasta `self.warmup` corridas; si hay tolerancia configurada se
+        detienen antes cuando dos tiempos consecutivos difieren menos que ella.
+        """
+        warmup_results = []
+        
+        for rep in range(self.warmup):
+            self.log("DEBUG", f"Warm-up {rep + 1}/{self.warmup}")
+            
+            result = await self.run_benchmark_async(practice, param_set, cpus)
+            result.warmup = True
+            warmup_results.append(result)
+            
+            # Esperar reposo antes de la siguiente corrida
+            await self.cooldown(cpus)
+            
+            if self.warmup_tolerance is not None and len(warmup_results) >= 2:
+                previous, current = warmup_results[-2], warmup_results[-1]
+                if previous.success and current.success and previous.execution_time > 0:
+                    change = abs(current.execution_time - previous.execution_time) / previous.execution_time
+                    if change <= self.warmup_tolerance:
+                        self.log("DEBUG", f"Warm-up estable tras {len(warmup_results)} corridas ({change:.1%})")
+                        break
+        
+        return warmup_results
+    
+    def repetitions_complete(self, results: List[BenchmarkResult], elapsed: float) -> Optional[str]:
+        """Motivo para dejar de repetir una configuración (None = faltan repeticiones)"""
+        if self.adaptive:
+            return self.adaptive_stop_reason(results, elapsed)
+        return "repeticiones completas" if len(results) >= self.repetitions else None
+    
+    def adaptive_stop_reason(self, results: List[BenchmarkResult], elapsed: float) -> Optional[str]:
+        """Decidir si una configuración ya tiene suficientes repeticiones (None = continuar)"""
+        successful_results = [r for r in results if r.success]
+        
+        if len(results) >= ADAPTIVE_MIN_REPETITIONS:
+            if not successful_results:
+                return "sin ejecuciones exitosas"
+            if len(successful_results) >= ADAPTIVE_MIN_REPETITIONS:
+                time_ci = relative_ci_half_width([r.execution_time for r in successful_results])
+                throughput_ci = relative_ci_half_width([r.throughput for r in successful_results])
+                if max(time_ci, throughput_ci) <= self.target_ci:
+                    return f"IC ±{max(time_ci, throughput_ci):.1%} alcanzado"
+        
+        if len(results) >= self.max_repetitions:
+            return "máximo de repeticiones"
+        if elapsed >= self.time_budget:
+            return "presupuesto de tiempo agotado"
+        return None
+    
+    def calculate_adaptive_statistics(self, suite: BenchmarkSuite) -> Dict[str, Any]:
+        """Repeticiones finales e IC alcanzado por configuración en modo adaptativo"""
+        config_groups = {}
+        for result in measured_runs(suite.results):
+            config_groups.setdefault(result.config, []).append(result)
         
-        except Exception as e:
-            self.log("DEBUG", f"Error parseando output: {e}")
+        adaptive_stats = {}
+        for config, results in config_groups.items():
+            successful_results = [r for r in results if r.success]
+            time_ci = relative_ci_half_width([r.execution_time for r in successful_results])
+            throughput_ci = relative_ci_half_width([r.throughput for r in successful_results])
+            achieved = max(time_ci, throughput_ci)
+            adaptive_stats[config] = {
+                'repetitions': len(results),
+                'successful_repetitions': len(successful_results),
+                'time_ci_rel': time_ci if time_ci != float('inf') else None,
+                'throughput_ci_rel': throughput_ci if throughput_ci != float('inf') else None,
+                'converged': achieved <= self.target_ci
+            }
         
-        return metrics
+        return {
+            'target_ci_rel': self.target_ci,
+            'max_repetitions': self.max_repetitions,
+            'time_budget': self.time_budget,
+            'configs': adaptive_stats
+        }
     
-    def calculate_throughput(self, practice: str, params: Dict[str, Any], 
-                           execution_time: float, metrics: Dict[str, Any]) -> float:
-        """Calcular throughput en operaciones por segundo"""
-        if execution_time <= 0:
-            return 0.0
+    def calculate_scaling_statistics(self, suite: BenchmarkSuite,
+                                     metric: Optional[str] = None) -> Dict[str, Any]:
+        """Speedup, eficiencia y ajustes Amdahl/USL en función del número de hilos
         
-        try:
-            if practice == 'p1_counter':
-                total_ops = params['threads'] * params['iterations']
-                return total_ops / execution_time
-            
-            elif practice == 'p2_ring':
-                total_items = params['producers'] * params['items']
-                return total_items / execution_time
-            
-            elif practice == 'p3_rw':
-                total_ops = params['threads'] * params['operations']
-                return total_ops / execution_time
+        Las configuraciones se agrupan por el resto de sus parámetros (ej: una
+        serie por valor de iterations) y se comparan contra la de 1 hilo, o la
+        de menos hilos si el barrido no incluye 1. Con metric se usa ese
+        throughput de result.metrics en lugar del throughput de la corrida.
+        """
+        params_by_config = {config_string(p): p for p in self.grids.get(suite.practice, [])}
+        
+        series: Dict[str, Dict[int, List[float]]] = {}
+        for result in measured_runs(suite.results):
+            params = params_by_config.get(result.config)
+            value = result.metrics.get(metric) if metric else result.throughput
+            if not result.success or params is None or value is None:
+                continue
+            rest = config_string({k: v for k, v in params.items() if k != 'threads'}) or 'default'
+            series.setdefault(rest, {}).setdefault(int(params['threads']), []).append(value)
+        
+        scaling = {}
+        for rest, by_threads in series.items():
+            if len(by_threads) < 2:
+                continue
+            points = {n: statistics.mean(values) for n, values in by_threads.items()}
+            base = min(points)
+            if points[base] <= 0:
+                continue
             
-            elif practice == 'p4_deadlock':
-                # Para deadlock, throughput no es tan relevante
-                return 1.0 / execution_time if execution_time > 0 else 0.0
+            curve = []
+            for n in sorted(points):
+                speedup = points[n] / points[base]
+                curve.append({
+                    'threads': n,
+                    'throughput': points[n],
+                    'speedup': speedup,
+                    'efficiency': speedup / (n / base)
+                })
             
-            elif practice == 'p5_pipeline':
-                # Para pipeline, usar ticks procesados
-                return params['ticks'] / execution_time
+            scaling[rest] = {'baseline_threads': base, 'curve': curve, **fit_scalability(points)}
+        
+        return scaling
+    
+    def calculate_strategy_statistics(self, suite: BenchmarkSuite) -> Dict[str, Any]:
+        """Promedios por estrategia y configuración de p1_counter, series de escalado
+        y verificación del umbral de overhead mutex vs atomic de notes.txt"""
+        successful_results = [r for r in measured_runs(suite.results) if r.success]
+        strategies = list(dict.fromkeys(key[:-len('_time')] for r in successful_results
+                                        for key in r.metrics if key.endswith('_time')))
+        
+        config_groups: Dict[str, List[BenchmarkResult]] = {}
+        for result in successful_results:
+            config_groups.setdefault(result.config, []).append(result)
+        
+        per_strategy = {}
+        for strategy in strategies:
+            configs = {}
+            for config, results in config_groups.items():
+                summary = {}
+                for name in ('time', 'throughput', 'lost_update_rate', 'overhead_vs_atomic'):
+                    values = [r.metrics[f'{strategy}_{name}'] for r in results
+                              if f'{strategy}_{name}' in r.metrics]
+                    if values:
+                        summary[f'{name}_mean'] = statistics.mean(values)
+                if summary:
+                    configs[config] = summary
             
-        except Exception as e:
-            self.log("DEBUG", f"Error calculando throughput: {e}")
+            per_strategy[strategy] = {
+                'configs': configs,
+                'scalability': self.calculate_scaling_statistics(suite, metric=f'{strategy}_throughput')
+            }
         
-        return 0.0
+        # Umbral: el mutex no debería ser más de un 30% más lento que atomic
+        overheads = {config: summary['overhead_vs_atomic_mean']
+                     for config, summary in per_strategy.get('mutex', {}).get('configs', {}).items()
+                     if 'overhead_vs_atomic_mean' in summary}
+        threshold = {
+            'limit': MUTEX_ATOMIC_OVERHEAD_LIMIT,
+            'max_overhead': max(overheads.values()) if overheads else None,
+            'violations': [config for config, overhead in overheads.items()
+                           if overhead > MUTEX_ATOMIC_OVERHEAD_LIMIT],
+        }
+        threshold['passed'] = bool(overheads) and not threshold['violations']
+        
+        if threshold['violations']:
+            self.log("WARN", f"Overhead mutex vs atomic supera {MUTEX_ATOMIC_OVERHEAD_LIMIT:.0%} "
+                             f"en {len(threshold['violations'])} configuraciones (máx {threshold['max_overhead']:.0%})")
+        
+        return {'strategies': per_strategy, 'mutex_vs_atomic_threshold': threshold}
     
-    def run_practice_suite(self, practice: str) -> BenchmarkSuite:
-        """Ejecutar suite completa de benchmarks para una práctica"""
-        if practice not in PRACTICE_CONFIGS:
-            raise ValueError(f"Práctica desconocida: {practice}")
+    def calculate_latency_statistics(self, suite: BenchmarkSuite) -> Dict[str, Any]:
+        """Percentiles de latencia por item combinando los histogramas de todas las repeticiones"""
+        successful_results = [r for r in measured_runs(suite.results) if r.success]
+        merged = merged_latency_histograms(successful_results)
+        if not merged:
+            return {}
         
-        if not self.check_executable(practice):
-            raise RuntimeError(f"Ejecutable no disponible para práctica {practice}")
+        overall = LatencyHistogram()
+        for histogram in merged.values():
+            overall.merge(histogram)
         
-        config = PRACTICE_CONFIGS[practice]
-        self.log("INFO", f"Iniciando suite de benchmarks: {config['name']}")
+        return {
+            'unit': 'ms',
+            'configs': {config: histogram.summary() for config, histogram in merged.items()},
+            'overall': overall.summary()
+        }
+    
+    def calculate_ring_statistics(self, suite: BenchmarkSuite) -> Dict[str, Any]:
+        """Bloqueos, pérdidas y throughput por topología P/C de p2_ring
         
-        suite_results = []
+        Con el búfer lleno bloquean los productores (consumer-bound) y con el
+        búfer vacío los consumidores (producer-bound): la relación entre ambos
+        bloqueos por item clasifica cada topología.
+        """
+        params_by_config = {config_string(p): p for p in self.grids.get(suite.practice, [])}
         
-        for param_set in config['params']:
-            self.log("INFO", f"Configuración: {param_set}")
-            
-            # Ejecutar múltiples repeticiones
-            repetition_results = []
+        # (items por productor, P, C) -> {métrica: [valores]}
+        groups: Dict[Tuple[int, int, int], Dict[str, List[float]]] = {}
+        queue_size = None
+        for result in measured_runs(suite.results):
+            params = params_by_config.get(result.config)
+            if not result.success or params is None:
+                continue
+            queue_size = result.metrics.get('queue_size', queue_size)
+            for key, value in result.metrics.items():
+                match = re.fullmatch(r'(\d+)p(\d+)c_(\w+)', key)
+                if match:
+                    group = groups.setdefault((int(params['items']), int(match.group(1)), int(match.group(2))), {})
+                    group.setdefault(match.group(3), []).append(value)
+        
+        topologies = []
+        for (items, producers, consumers), values in sorted(groups.items()):
+            row = {
+                'items': items,
+                'producers': producers,
+                'consumers': consumers,
+                'topology': f"{'M' if producers > 1 else 'S'}P{'M' if consumers > 1 else 'S'}C",
+                'pc_ratio': producers / consumers,
+                'runs': max(len(v) for v in values.values()),
+                **{f'{name}_mean': statistics.mean(v) for name, v in values.items()}
+            }
             
-            for rep in range(self.repetitions):
-                self.log("DEBUG", f"Repetición {rep + 1}/{self.repetitions}")
+            producer_blocks = row.get('producer_blocks_per_item_mean', 0.0)
+            consumer_blocks = row.get('consumer_blocks_per_item_mean', 0.0)
+            if producer_blocks > RING_BOUND_FACTOR * consumer_blocks:
+                row['bound'] = 'consumer'
+            elif consumer_blocks > RING_BOUND_FACTOR * producer_blocks:
+                row['bound'] = 'producer'
+            else:
+                row['bound'] = 'balanced'
+            topologies.append(row)
+        
+        # Umbral de notes.txt: pérdida en búfer circular < 1%
+        violations = [f"{r['producers']}P/{r['consumers']}C ({r['items']})" for r in topologies
+                      if r.get('loss_rate_mean', 0.0) > RING_LOSS_LIMIT]
+        if violations:
+            self.log("WARN", f"Pérdida en búfer circular supera {RING_LOSS_LIMIT:.0%} en: {', '.join(violations)}")
+        
+        return {
+            'queue_size': queue_size,
+            'topologies': topologies,
+            'loss_threshold': {'limit': RING_LOSS_LIMIT, 'violations': violations, 'passed': not violations}
+        }
+    
+    def calculate_rw_matrix_statistics(self, suite: BenchmarkSuite) -> Dict[str, Any]:
+        """Matriz threads × % lecturas × tipo de lock de p3_rw y punto de cruce
+        
+        El cruce es el % de lecturas a partir del cual RWLock supera a Mutex
+        (speedup > 1) en todas las proporciones medidas más altas, más la
+        interpolación lineal del punto donde el speedup cruza 1.
+        """
+        params_by_config = {config_string(p): p for p in self.grids.get(suite.practice, [])}
+        
+        # (resto de parámetros, threads, % lecturas) -> {lock: [throughputs]}
+        cells: Dict[Tuple[str, int, int], Dict[str, List[float]]] = {}
+        for result in measured_runs(suite.results):
+            params = params_by_config.get(result.config)
+            if not result.success or params is None:
+                continue
+            rest = config_string({k: v for k, v in params.items() if k != 'threads'}) or 'default'
+            for key, value in result.metrics.items():
+                match = re.fullmatch(r'(mutex|rwlock)_(\d+)_throughput', key)
+                if match:
+                    cell = cells.setdefault((rest, int(params['threads']), int(match.group(2))), {})
+                    cell.setdefault(match.group(1), []).append(value)
+        
+        matrix = []
+        for (rest, threads, read_pct), locks in sorted(cells.items()):
+            mutex = statistics.mean(locks['mutex']) if 'mutex' in locks else None
+            rwlock = statistics.mean(locks['rwlock']) if 'rwlock' in locks else None
+            matrix.append({
+                'series': rest,
+                'threads': threads,
+                'read_pct': read_pct,
+                'mutex_throughput': mutex,
+                'rwlock_throughput': rwlock,
+                'speedup': rwlock / mutex if mutex and rwlock is not None else None,
+                'runs': min(len(v) for v in locks.values())
+            })
+        
+        crossover: Dict[str, Dict[str, Any]] = {}
+        for row in matrix:
+            crossover.setdefault(row['series'], {}).setdefault(row['threads'], []).append(row)
+        
+        for rest, by_threads in crossover.items():
+            for threads, rows in by_threads.items():
+                curve = [(r['read_pct'], r['speedup']) for r in rows if r['speedup'] is not None]
                 
-                result = self.run_single_benchmark(practice, param_set)
-                repetition_results.append(result)
-                suite_results.append(result)
+                # Menor % de lecturas desde el cual RWLock gana en todo lo que sigue
+                pays_off_from = None
+                for read_pct, speedup in reversed(curve):
+                    if speedup <= 1:
+                        break
+                    pays_off_from = read_pct
                 
-                # Pausa entre repeticiones
-                if rep < self.repetitions - 1:
-                    time.sleep(0.5)
-            
-            # Calcular estadísticas para esta configuración
-            successful_results = [r for r in repetition_results if r.success]
-            if successful_results:
-                times = [r.execution_time for r in successful_results]
-                throughputs = [r.throughput for r in successful_results]
+                # Interpolación del último cruce ascendente de speedup = 1
+                crossing = None
+                for (x0, y0), (x1, y1) in zip(curve, curve[1:]):
+                    if y0 <= 1 < y1:
+                        crossing = x0 + (1 - y0) * (x1 - x0) / (y1 - y0)
                 
-                self.log("SUCCESS", 
-                    f"Config completada - Tiempo promedio: {statistics.mean(times):.3f}s ± {statistics.stdev(times) if len(times) > 1 else 0:.3f}s")
-        
-        # Crear suite con estadísticas
-        suite = BenchmarkSuite(
-            practice=practice,
-            name=config['name'],
-            results=suite_results
-        )
+                by_threads[threads] = {
+                    'pays_off_from_read_pct': pays_off_from,
+                    'crossover_read_pct': crossing,
+                    'max_speedup': max((speedup for _, speedup in curve), default=None)
+                }
         
-        suite.statistics = self.calculate_suite_statistics(suite)
-        
-        self.suites[practice] = suite
-        self.log("SUCCESS", f"Suite {config['name']} completada con {len(suite_results)} resultados")
+        return {'matrix': matrix, 'crossover': crossover}
+    
+    def flag_outliers(self, results: List[BenchmarkResult]):
+        """Marcar (sin descartar) las corridas atípicas en tiempo dentro de cada configuración"""
+        config_groups: Dict[str, List[BenchmarkResult]] = {}
+        for result in results:
+            config_groups.setdefault(result.config, []).append(result)
         
-        return suite
+        for config, group in config_groups.items():
+            for result, flagged in zip(group, outlier_mask([r.execution_time for r in group])):
+                result.outlier = flagged
+                if flagged:
+                    self.log("DEBUG", f"Outlier en {config}: {result.execution_time:.3f}s")
     
     def calculate_suite_statistics(self, suite: BenchmarkSuite) -> Dict[str, Any]:
-        """Calcular estadísticas para una suite completa"""
-        successful_results = [r for r in suite.results if r.success]
+        """Calcular estadísticas para una suite completa (sin corridas de warm-up)
+        
+        Tiempos y throughputs sólo se resumen por configuración: promediar
+        threads=1 con threads=8 no tiene sentido. A nivel de suite quedan los
+        conteos de corridas y el uso de recursos.
+        """
+        runs = measured_runs(suite.results)
+        successful_results = [r for r in runs if r.success]
+        warmup_runs = len(suite.results) - len(runs)
         
         if not successful_results:
-            return {'success_rate': 0.0, 'total_runs': len(suite.results)}
+            return {'success_rate': 0.0, 'total_runs': len(runs), 'warmup_runs': warmup_runs}
         
-        times = [r.execution_time for r in successful_results]
-        throughputs = [r.throughput for r in successful_results]
+        self.flag_outliers(successful_results)
+        
+        config_groups: Dict[str, List[BenchmarkResult]] = {}
+        for result in runs:
+            config_groups.setdefault(result.config, []).append(result)
         
         stats = {
-            'success_rate': len(successful_results) / len(suite.results),
-            'total_runs': len(suite.results),
+            'success_rate': len(successful_results) / len(runs),
+            'total_runs': len(runs),
             'successful_runs': len(successful_results),
-            'time_stats': {
-                'mean': statistics.mean(times),
-                'median': statistics.median(times),
-                'stdev': statistics.stdev(times) if len(times) > 1 else 0.0,
-                'min': min(times),
-                'max': max(times)
-            },
-            'throughput_stats': {
-                'mean': statistics.mean(throughputs),
-                'median': statistics.median(throughputs),
-                'stdev': statistics.stdev(throughputs) if len(throughputs) > 1 else 0.0,
-                'min': min(throughputs),
-                'max': max(throughputs)
-            }
+            'warmup_runs': warmup_runs,
+            'outlier_runs': sum(r.outlier for r in successful_results),
+            'configs': {config: self.calculate_config_statistics(suite.practice, config, results)
+                        for config, results in config_groups.items()},
+            'rusage_stats': self.calculate_rusage_statistics(successful_results)
+        }
+        
+        return stats
+    
+    def calculate_config_statistics(self, practice: str, config: str,
+                                    results: List[BenchmarkResult]) -> Dict[str, Any]:
+        """Tiempo, throughput (total, por hilo y por item) y estrategias de una configuración"""
+        params = {config_string(p): p for p in self.grids.get(practice, [])}.get(config, {})
+        successful_results = [r for r in results if r.success]
+        
+        stats = {
+            'params': params,
+            'runs': len(results),
+            'successful_runs': len(successful_results),
+            'success_rate': len(successful_results) / len(results)
         }
+        if not successful_results:
+            return stats
+        
+        outliers = [r.outlier for r in successful_results]
+        throughput = summary_statistics([r.throughput for r in successful_results], outliers)
+        workers = self.scale_factor(practice, params, 'workers')
+        items = self.scale_factor(practice, params, 'work')
+        
+        stats.update({
+            'outlier_runs': sum(outliers),
+            'time_stats': summary_statistics([r.execution_time for r in successful_results], outliers),
+            'throughput_stats': throughput,
+            'workers': workers,
+            'items': items,
+            'throughput_per_thread': throughput['mean'] / workers if workers else None,
+            'ns_per_item': (statistics.fmean(r.execution_time for r in successful_results) / items * 1e9
+                            if items else None),
+            'rusage_stats': self.calculate_rusage_statistics(successful_results)
+        })
+        
+        # Estrategias/secciones que el binario reporta por separado ({nombre}_throughput en metrics);
+        # las etapas del log del pipeline (log_*) se miden aparte y no son estrategias
+        strategies = {}
+        names = dict.fromkeys(key[:-len('_throughput')] for r in successful_results
+                              for key in r.metrics
+                              if key.endswith('_throughput') and not key.startswith(LOG_METRIC_PREFIX))
+        for name in names:
+            values = [r.metrics[f'{name}_throughput'] for r in successful_results
+                      if f'{name}_throughput' in r.metrics]
+            summary = {'throughput_stats': summary_statistics(values)}
+            times = [r.metrics[f'{name}_time'] for r in successful_results if f'{name}_time' in r.metrics]
+            if times:
+                summary['time_stats'] = summary_statistics(times)
+            
+            # Las secciones de topología de p2 (ej: 2p1c) fijan sus propios hilos
+            topology = re.match(r'(\d+)p(\d+)c_', name)
+            strategy_workers = int(topology.group(1)) + int(topology.group(2)) if topology else workers
+            summary['throughput_per_thread'] = (summary['throughput_stats']['mean'] / strategy_workers
+                                                if strategy_workers else None)
+            strategies[name] = summary
+        
+        if strategies:
+            stats['strategies'] = strategies
         
         return stats
     
+    def scale_factor(self, practice: str, params: Dict[str, Any], kind: str) -> Optional[int]:
+        """Hilos trabajadores ('workers') o items procesados ('work') de una configuración
+        
+        Cada entrada de la lista es un parámetro o una suma 'a+b'; las entradas se multiplican.
+        """
+        terms = PRACTICE_CONFIGS[practice].get(kind)
+        if not terms:
+            return None
+        try:
+            factor = 1
+            for term in terms:
+                factor *= sum(int(params[name]) for name in term.split('+'))
+            return factor
+        except KeyError:
+            return None
+    
+    def calculate_rusage_statistics(self, results: List[BenchmarkResult]) -> Dict[str, Any]:
+        """Promedios de CPU, memoria y cambios de contexto de los procesos hijos"""
+        cpu_times = [r.user_time + r.system_time for r in results]
+        wall_times = [r.execution_time for r in results]
+        
+        return {
+            'user_time_mean': statistics.mean(r.user_time for r in results),
+            'system_time_mean': statistics.mean(r.system_time for r in results),
+            # CPUs ocupados en promedio: >1 indica hilos realmente en paralelo (o spinning)
+            'cpu_utilization': sum(cpu_times) / sum(wall_times) if sum(wall_times) > 0 else 0.0,
+            'system_time_ratio': (sum(r.system_time for r in results) / sum(cpu_times)
+                                  if sum(cpu_times) > 0 else 0.0),
+            'voluntary_ctx_switches_mean': statistics.mean(r.voluntary_ctx_switches for r in results),
+            'involuntary_ctx_switches_mean': statistics.mean(r.involuntary_ctx_switches for r in results),
+            'max_rss_kb': max(r.max_rss_kb for r in results)
+        }
+    
     def save_results_csv(self, filename: Path = RESULTS_FILE):
         """Guardar resultados en formato CSV"""
         filename.parent.mkdir(exist_ok=True)
+        register_host(self.host_id, self.host)
+        
+        fieldnames = [
+            'practice', 'config', 'timestamp', 'execution_time',
+            'throughput', 'success', 'host_id', 'cpu_set', 'warmup', 'cached', 'outlier', *RUSAGE_FIELDS,
+            'output_ref', 'additional_metrics'
+        ]
         
         # Verificar si el archivo existe para agregar header
         file_exists = filename.exists()
+        if file_exists:
+            self.migrate_csv_header(filename, fieldnames)
         
         with open(filename, 'a', newline='', encoding='utf-8') as csvfile:
-            fieldnames = [
-                'practice', 'config', 'timestamp', 'execution_time', 
-                'throughput', 'success', 'additional_metrics'
-            ]
-            
             writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
             
             # Escribir header solo si es archivo nuevo
             if not file_exists:
                 writer.writeheader()
             
-            # Escribir resultados
+            # Escribir resultados (las corridas servidas desde la caché ya están
+            # guardadas de la sesión que las midió: re-escribirlas las duplicaría)
             for result in self.results:
+                if result.cached:
+                    continue
                 writer.writerow({
                     'practice': result.practice,
                     'config': result.config,
@@ -522,20 +3511,128 @@ class Lab06Benchmarker:
                     'execution_time': result.execution_time,
                     'throughput': result.throughput,
                     'success': result.success,
+                    'host_id': result.host_id,
+                    'cpu_set': result.cpu_set,
+                    'warmup': result.warmup,
+                    'cached': result.cached,
+                    'outlier': result.outlier,
+                    **{field: getattr(result, field) for field in RUSAGE_FIELDS},
+                    'output_ref': result.output_ref,
                     'additional_metrics': json.dumps(result.metrics)
                 })
         
         self.log("SUCCESS", f"Resultados guardados en {filename}")
     
+    def save_results_db(self, path: Path = RESULTS_DB):
+        """Insertar la sesión y sus corridas en la base de datos SQLite"""
+        database = ResultDatabase(path)
+        try:
+            session_id = database.insert_session(self.results, host_id=self.host_id,
+                                                 command=' '.join(sys.argv), log_file=str(self.log_file))
+        finally:
+            database.close()
+        if session_id is not None:
+            self.log("SUCCESS", f"Sesión {session_id} guardada en {path}")
+    
+    def save_results_columnar(self, path: Path = COLUMNAR_DIR):
+        """Agregar los resultados al almacén columnar como una parte nueva"""
+        store = ColumnarStore(path)
+        if store.backend is None:
+            self.log("WARN", "Almacén columnar requiere pyarrow o numpy - omitido")
+            return
+        part = store.append([r for r in self.results if not r.cached])
+        if part:
+            self.log("SUCCESS", f"Resultados en columnas ({store.backend}) guardados en {part}")
+    
+    def migrate_csv_header(self, filename: Path, fieldnames: List[str]):
+        """Reescribir un CSV existente si su header no coincide con las columnas actuales"""
+        with open(filename, 'r', newline='', encoding='utf-8') as csvfile:
+            reader = csv.DictReader(csvfile)
+            if reader.fieldnames == fieldnames:
+                return
+            rows = list(reader)
+        
+        self.log("WARN", f"Header de {filename} desactualizado - migrando {len(rows)} filas")
+        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(rows)
+    
+    def sweep_tables(self) -> Dict[str, Any]:
+        """Tabla de resultados por configuración y promedios marginales por dimensión"""
+        tables = {}
+        for practice, grid in self.grids.items():
+            measured = [r for r in measured_runs(self.results) if r.practice == practice and r.success]
+            by_config: Dict[str, List[BenchmarkResult]] = {}
+            for result in measured:
+                by_config.setdefault(result.config, []).append(result)
+            
+            rows = []
+            for params in grid:
+                runs = by_config.get(config_string(params), [])
+                times = [r.execution_time for r in runs]
+                throughputs = [r.throughput for r in runs]
+                rows.append({
+                    **params,
+                    'runs': len(runs),
+                    'mean_time': statistics.mean(times) if times else None,
+                    'std_time': statistics.stdev(times) if len(times) > 1 else 0.0,
+                    'mean_throughput': statistics.mean(throughputs) if throughputs else None,
+                    'median_throughput': statistics.median(throughputs) if throughputs else None
+                })
+            
+            # Promedio de throughput para cada valor de cada dimensión (sobre el resto)
+            dimensions = sweep_dimensions(grid)
+            marginals = {}
+            for dim in dimensions:
+                marginal = {}
+                for value in dict.fromkeys(params[dim] for params in grid):
+                    values = [row['mean_throughput'] for row in rows
+                              if row[dim] == value and row['mean_throughput'] is not None]
+                    marginal[str(value)] = statistics.mean(values) if values else None
+                marginals[dim] = marginal
+            
+            tables[practice] = {'dimensions': dimensions, 'table': rows, 'marginals': marginals}
+        return tables
+    
+    def save_sweep_table(self, filename: Path = SWEEP_TABLE_FILE):
+        """Guardar la tabla del barrido (una fila por configuración) en CSV"""
+        tables = self.sweep_tables()
+        if not tables:
+            return
+        
+        dims = list(dict.fromkeys(name for practice in tables for name in PRACTICE_CONFIGS[practice]['args']))
+        fieldnames = ['practice', *dims, 'runs', 'mean_time', 'std_time', 'mean_throughput', 'median_throughput']
+        
+        filename.parent.mkdir(exist_ok=True)
+        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            writer.writeheader()
+            for practice, table in tables.items():
+                for row in table['table']:
+                    writer.writerow({'practice': practice, **row})
+        
+        self.log("SUCCESS", f"Tabla del barrido guardada en {filename}")
+    
     def save_analysis_json(self, filename: Path = ANALYSIS_FILE):
         """Guardar análisis completo en formato JSON"""
         analysis_data = {
             'timestamp': datetime.datetime.now().isoformat(),
             'configuration': {
                 'repetitions': self.repetitions,
-                'timeout': self.timeout
+                'timeout': self.timeout,
+                'parallel': self.parallel,
+                'adaptive': self.adaptive,
+                'warmup': self.warmup,
+                'cooldown_max': self.quiescence.max_wait,
+                'reuse': self.reuse,
+                'harness_version': HARNESS_VERSION,
+                'host_id': self.host_id,
+                'host': self.host,
+                'cpus': format_cpu_set(self.partitioner.cpus) if self.partitioner else None
             },
-            'suites': {}
+            'suites': {},
+            'sweeps': self.sweep_tables()
         }
         
         for practice, suite in self.suites.items():
@@ -577,7 +3674,7 @@ class Lab06Benchmarker:
     def create_practice_plots(self, suite: BenchmarkSuite, plots_dir: Path):
         """Crear gráficas específicas para una práctica"""
         practice = suite.practice
-        successful_results = [r for r in suite.results if r.success]
+        successful_results = [r for r in measured_runs(suite.results) if r.success]
         
         if not successful_results:
             self.log("WARN", f"No hay resultados exitosos para {practice}")
@@ -633,8 +3730,198 @@ class Lab06Benchmarker:
         plt.savefig(plots_dir / f"{practice}_performance.png", dpi=300, bbox_inches='tight')
         plt.close()
         
+        self.create_rusage_plots(suite, configs, config_groups, plots_dir)
+        
+        if 'strategies' in suite.statistics:
+            self.create_strategy_plots(suite, plots_dir)
+        if suite.statistics.get('rw_matrix', {}).get('matrix'):
+            self.create_rw_matrix_plots(suite, plots_dir)
+        if suite.statistics.get('topologies', {}).get('topologies'):
+            self.create_ring_plots(suite, plots_dir)
+        if 'latency' in suite.statistics:
+            self.create_latency_plots(suite, plots_dir)
+        
         self.log("SUCCESS", f"Gráficas guardadas para {practice}")
     
+    def create_strategy_plots(self, suite: BenchmarkSuite, plots_dir: Path):
+        """Throughput por estrategia de p1_counter en función del número de hilos"""
+        strategies = suite.statistics['strategies']['strategies']
+        
+        fig, ax = plt.subplots(figsize=(10, 6))
+        plotted = False
+        for strategy, data in strategies.items():
+            for rest, series in data['scalability'].items():
+                threads = [point['threads'] for point in series['curve']]
+                throughputs = [point['throughput'] for point in series['curve']]
+                label = strategy if len(data['scalability']) == 1 else f"{strategy} ({rest})"
+                ax.plot(threads, throughputs, marker='o', label=label)
+                plotted = True
+        
+        if not plotted:
+            plt.close()
+            return
+        
+        ax.set_xlabel('Threads')
+        ax.set_ylabel('Throughput (ops/seg)')
+        ax.set_yscale('log')
+        ax.set_title(f'{suite.name} - Escalado por Estrategia')
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+        
+        plt.tight_layout()
+        plt.savefig(plots_dir / f"{suite.practice}_strategies.png", dpi=300, bbox_inches='tight')
+        plt.close()
+    
+    def create_latency_plots(self, suite: BenchmarkSuite, plots_dir: Path):
+        """CDF de latencia por configuración y cola (1 - CDF) en escala logarítmica"""
+        merged = merged_latency_histograms([r for r in measured_runs(suite.results) if r.success])
+        
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+        for config, histogram in merged.items():
+            xs, ys = histogram.cdf_ms()
+            ax1.plot(xs, ys, label=config)
+            # La cola se corta antes de 1 - CDF = 0 para poder usar escala log
+            tail = [(x, 1 - y) for x, y in zip(xs, ys) if y < 1]
+            ax2.plot([t[0] for t in tail], [t[1] for t in tail], label=config)
+        
+        ax1.set_xscale('log')
+        ax1.set_xlabel('Latencia (ms)')
+        ax1.set_ylabel('Fracción acumulada')
+        ax1.set_title(f'{suite.name} - CDF de Latencia')
+        ax1.legend()
+        ax1.grid(True, alpha=0.3)
+        
+        for q in HISTOGRAM_PERCENTILES[1:]:
+            ax2.axhline(1 - q / 100, color='gray', linestyle=':', linewidth=0.8)
+        ax2.set_xscale('log')
+        ax2.set_yscale('log')
+        ax2.set_xlabel('Latencia (ms)')
+        ax2.set_ylabel('1 - CDF')
+        ax2.set_title('Cola de Latencia (p90 / p99 / p99.9)')
+        ax2.legend()
+        ax2.grid(True, alpha=0.3)
+        
+        plt.tight_layout()
+        plt.savefig(plots_dir / f"{suite.practice}_latency_cdf.png", dpi=300, bbox_inches='tight')
+        plt.close()
+    
+    def create_ring_plots(self, suite: BenchmarkSuite, plots_dir: Path):
+        """Bloqueos por item y throughput por topología P/C de p2_ring"""
+        rows = suite.statistics['topologies']['topologies']
+        labels = [f"{r['producers']}P/{r['consumers']}C" + (f"\n{r['items']}" if len({x['items'] for x in rows}) > 1 else '')
+                  for r in rows]
+        x_pos = np.arange(len(rows))
+        
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+        
+        ax1.bar(x_pos - 0.2, [r.get('producer_blocks_per_item_mean', 0) for r in rows], 0.4, label='Productor (búfer lleno)')
+        ax1.bar(x_pos + 0.2, [r.get('consumer_blocks_per_item_mean', 0) for r in rows], 0.4, label='Consumidor (búfer vacío)')
+        ax1.set_xticks(x_pos)
+        ax1.set_xticklabels(labels)
+        ax1.set_ylabel('Bloqueos por item')
+        ax1.set_title(f"{suite.name} - Bloqueos (cola de {suite.statistics['topologies']['queue_size']})")
+        ax1.legend()
+        ax1.grid(True, alpha=0.3)
+        
+        ax2.bar(x_pos - 0.2, [r.get('production_throughput_mean', 0) for r in rows], 0.4, label='Producción')
+        ax2.bar(x_pos + 0.2, [r.get('consumption_throughput_mean', 0) for r in rows], 0.4, label='Consumo')
+        ax2.set_xticks(x_pos)
+        ax2.set_xticklabels(labels)
+        ax2.set_ylabel('Throughput (items/seg)')
+        ax2.set_title('Throughput por Topología')
+        ax2.legend()
+        ax2.grid(True, alpha=0.3)
+        
+        plt.tight_layout()
+        plt.savefig(plots_dir / f"{suite.practice}_topologies.png", dpi=300, bbox_inches='tight')
+        plt.close()
+    
+    def create_rw_matrix_plots(self, suite: BenchmarkSuite, plots_dir: Path):
+        """Heatmap de speedup RWLock/Mutex (threads × % lecturas) y curvas de cruce"""
+        matrix = [row for row in suite.statistics['rw_matrix']['matrix'] if row['speedup'] is not None]
+        if not matrix:
+            return
+        
+        for rest in dict.fromkeys(row['series'] for row in matrix):
+            rows = [row for row in matrix if row['series'] == rest]
+            threads = sorted({row['threads'] for row in rows})
+            read_pcts = sorted({row['read_pct'] for row in rows})
+            grid = np.full((len(threads), len(read_pcts)), np.nan)
+            for row in rows:
+                grid[threads.index(row['threads']), read_pcts.index(row['read_pct'])] = row['speedup']
+            
+            fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+            
+            # Heatmap centrado en speedup = 1 (rojo: gana Mutex, verde: gana RWLock)
+            spread = max(abs(np.nanmax(grid) - 1), abs(1 - np.nanmin(grid)), 0.01)
+            image = ax1.imshow(grid, cmap='RdYlGn', vmin=1 - spread, vmax=1 + spread,
+                               aspect='auto', origin='lower')
+            for i in range(len(threads)):
+                for j in range(len(read_pcts)):
+                    if not np.isnan(grid[i, j]):
+                        ax1.text(j, i, f"{grid[i, j]:.2f}", ha='center', va='center', fontsize=9)
+            ax1.set_xticks(range(len(read_pcts)))
+            ax1.set_xticklabels([f"{pct}%" for pct in read_pcts])
+            ax1.set_yticks(range(len(threads)))
+            ax1.set_yticklabels(threads)
+            ax1.set_xlabel('Lecturas')
+            ax1.set_ylabel('Threads')
+            ax1.set_title(f'{suite.name} - Speedup RWLock vs Mutex')
+            fig.colorbar(image, ax=ax1)
+            
+            # Curvas de cruce: speedup vs % lecturas por número de hilos
+            for n in threads:
+                points = sorted((row['read_pct'], row['speedup']) for row in rows if row['threads'] == n)
+                ax2.plot([p[0] for p in points], [p[1] for p in points], marker='o', label=f'{n} threads')
+            ax2.axhline(1.0, color='gray', linestyle='--')
+            ax2.set_xlabel('Lecturas (%)')
+            ax2.set_ylabel('Speedup RWLock vs Mutex')
+            ax2.set_title('Punto de Cruce')
+            ax2.legend()
+            ax2.grid(True, alpha=0.3)
+            
+            plt.tight_layout()
+            suffix = '' if rest == 'default' or len({row['series'] for row in matrix}) == 1 else f"_{rest}"
+            plt.savefig(plots_dir / f"{suite.practice}_rw_matrix{suffix}.png", dpi=300, bbox_inches='tight')
+            plt.close()
+    
+    def create_rusage_plots(self, suite: BenchmarkSuite, configs: List[str],
+                            config_groups: Dict[str, List[BenchmarkResult]], plots_dir: Path):
+        """Gráficas de tiempo de CPU (usuario/sistema) y cambios de contexto por configuración"""
+        user_mean = [statistics.mean(r.user_time for r in config_groups[c]) for c in configs]
+        system_mean = [statistics.mean(r.system_time for r in config_groups[c]) for c in configs]
+        voluntary_mean = [statistics.mean(r.voluntary_ctx_switches for r in config_groups[c]) for c in configs]
+        involuntary_mean = [statistics.mean(r.involuntary_ctx_switches for r in config_groups[c]) for c in configs]
+        
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+        x_pos = np.arange(len(configs))
+        
+        # Tiempo de CPU apilado: mucho tiempo de sistema = futex/dormir, mucho de usuario = spinning
+        ax1.bar(x_pos, user_mean, alpha=0.7, label='Usuario')
+        ax1.bar(x_pos, system_mean, bottom=user_mean, alpha=0.7, color='red', label='Sistema')
+        ax1.set_xlabel('Configuración')
+        ax1.set_ylabel('Tiempo de CPU (segundos)')
+        ax1.set_title(f'{suite.name} - CPU Usuario vs Sistema')
+        ax1.set_xticks(x_pos)
+        ax1.set_xticklabels(configs, rotation=45, ha='right')
+        ax1.legend()
+        ax1.grid(True, alpha=0.3)
+        
+        width = 0.4
+        ax2.bar(x_pos - width / 2, voluntary_mean, width, alpha=0.7, label='Voluntarios')
+        ax2.bar(x_pos + width / 2, involuntary_mean, width, alpha=0.7, color='purple', label='Involuntarios')
+        ax2.set_xlabel('Configuración')
+        ax2.set_ylabel('Cambios de contexto')
+        ax2.set_title(f'{suite.name} - Cambios de Contexto')
+        ax2.set_xticks(x_pos)
+        ax2.set_xticklabels(configs, rotation=45, ha='right')
+        ax2.legend()
+        ax2.grid(True, alpha=0.3)
+        
+        plt.tight_layout()
+        plt.savefig(plots_dir / f"{suite.practice}_rusage.png", dpi=300, bbox_inches='tight')
+        plt.close()
+    
     def create_comparison_plots(self, plots_dir: Path):
         """Crear gráficas comparativas entre prácticas"""
         if len(self.suites) < 2:
@@ -648,7 +3935,7 @@ class Lab06Benchmarker:
         std_times = []
         
         for practice, suite in self.suites.items():
-            successful_results = [r for r in suite.results if r.success]
+            successful_results = [r for r in measured_runs(suite.results) if r.success]
             if successful_results:
                 times = [r.execution_time for r in successful_results]
                 practices.append(PRACTICE_CONFIGS[practice]['name'])
@@ -683,37 +3970,67 @@ class Lab06Benchmarker:
 # FUNCIONES DE ANÁLISIS Y REPORTES
 # ============================================================================
 
-def analyze_csv_results(csv_file: Path):
-    """Analizar resultados desde archivo CSV"""
+# Columnas que usa el análisis: del CSV o del almacén columnar sólo se leen éstas
+ANALYSIS_COLUMNS = ['practice', 'config', 'host_id', 'success', 'warmup', 'cached', 'execution_time', 'throughput']
+
+def is_true(value: Any) -> bool:
+    """Booleano de una celda de CSV ('True') o de una columna tipada (True)"""
+    return str(value or '').lower() == 'true'
+
+
+def read_result_rows(source: Path, columns: List[str]):
+    """Filas con las columnas pedidas desde un CSV o un directorio del almacén columnar"""
+    if source.is_dir():
+        yield from ColumnarStore(source).rows(columns)
+        return
+    with open(source, 'r', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            yield {name: row.get(name) for name in columns}
+
+def analyze_csv_results(csv_file: Path, host: Optional[str] = None):
+    """Analizar resultados desde un CSV o un almacén columnar (opcionalmente sólo los de un host)"""
     if not csv_file.exists():
         print(f"❌ Archivo no encontrado: {csv_file}")
         return
     
-    print(f"📊 Analizando resultados desde {csv_file}")
+    print(f"📊 Analizando resultados desde {csv_file}" + (f" (host {host})" if host else ""))
     
     if HAS_PANDAS:
-        analyze_with_pandas(csv_file)
+        analyze_with_pandas(csv_file, host)
     else:
-        analyze_with_builtin(csv_file)
+        analyze_with_builtin(csv_file, host)
 
-def analyze_with_pandas(csv_file: Path):
+def analyze_with_pandas(csv_file: Path, host: Optional[str] = None):
     """Análisis avanzado con pandas"""
     try:
-        df = pd.read_csv(csv_file)
+        if csv_file.is_dir():
+            df = pd.DataFrame(ColumnarStore(csv_file).read(ANALYSIS_COLUMNS))
+        else:
+            df = pd.read_csv(csv_file, usecols=lambda column: column in ANALYSIS_COLUMNS)
+        if 'warmup' in df.columns:
+            df = df[df['warmup'] != True]
+        if 'cached' in df.columns:
+            df = df[df['cached'] != True]
+        
+        # Resultados de máquinas distintas no se mezclan: se agrupan por host
+        df['host_id'] = df['host_id'].fillna('').astype(str) if 'host_id' in df.columns else ''
+        if host:
+            df = df[df['host_id'].str.startswith(host)]
+        hosts = load_hosts()
         
         print(f"\n=== RESUMEN GENERAL ===")
         print(f"Total de experimentos: {len(df)}")
         print(f"Prácticas analizadas: {', '.join(df['practice'].unique())}")
+        print(f"Hosts: {df['host_id'].nunique()}")
         print(f"Tasa de éxito: {df['success'].mean():.1%}")
         
-        # Análisis por práctica
+        # Análisis por host y práctica
         print(f"\n=== ANÁLISIS POR PRÁCTICA ===")
-        for practice in df['practice'].unique():
-            practice_df = df[df['practice'] == practice]
+        for (host_id, practice), practice_df in df.groupby(['host_id', 'practice'], sort=False):
             successful_df = practice_df[practice_df['success'] == True]
             
             if len(successful_df) > 0:
-                print(f"\n{practice.upper()}:")
+                print(f"\n{practice.upper()} [{describe_host(host_id, hosts)}]:")
                 print(f"  Éxito: {len(successful_df)}/{len(practice_df)} ({len(successful_df)/len(practice_df):.1%})")
                 print(f"  Tiempo promedio: {successful_df['execution_time'].mean():.3f}s ± {successful_df['execution_time'].std():.3f}s")
                 print(f"  Throughput promedio: {successful_df['throughput'].mean():.2f} ops/s")
@@ -723,7 +4040,7 @@ def analyze_with_pandas(csv_file: Path):
         print(f"\n=== TOP CONFIGURACIONES (THROUGHPUT) ===")
         top_configs = df[df['success'] == True].nlargest(5, 'throughput')
         for idx, row in top_configs.iterrows():
-            print(f"  {row['practice']} ({row['config']}): {row['throughput']:.2f} ops/s")
+            print(f"  {row['practice']} ({row['config']}) [{row['host_id'] or '?'}]: {row['throughput']:.2f} ops/s")
         
         # Crear gráfica si matplotlib disponible
         if HAS_MATPLOTLIB:
@@ -732,35 +4049,39 @@ def analyze_with_pandas(csv_file: Path):
     except Exception as e:
         print(f"❌ Error en análisis con pandas: {e}")
 
-def analyze_with_builtin(csv_file: Path):
+def analyze_with_builtin(csv_file: Path, host: Optional[str] = None):
     """Análisis básico con librerías estándar"""
     try:
+        # (host, práctica) -> resultados: no se mezclan máquinas distintas
         results_by_practice = {}
+        hosts = load_hosts()
         
-        with open(csv_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
+        for row in read_result_rows(csv_file, ANALYSIS_COLUMNS):
+            if is_true(row.get('warmup')) or is_true(row.get('cached')):
+                continue
+            host_id = row.get('host_id') or ''
+            if host and not host_id.startswith(host):
+                continue
+            practice = (host_id, row['practice'])
+            if practice not in results_by_practice:
+                results_by_practice[practice] = []
             
-            for row in reader:
-                practice = row['practice']
-                if practice not in results_by_practice:
-                    results_by_practice[practice] = []
-                
-                results_by_practice[practice].append({
-                    'config': row['config'],
-                    'time': float(row['execution_time']),
-                    'throughput': float(row['throughput']),
-                    'success': row['success'].lower() == 'true'
-                })
+            results_by_practice[practice].append({
+                'config': row['config'],
+                'time': float(row['execution_time']),
+                'throughput': float(row['throughput']),
+                'success': str(row['success']).lower() == 'true'
+            })
         
         print(f"\n=== ANÁLISIS BÁSICO ===")
-        for practice, results in results_by_practice.items():
+        for (host_id, practice), results in results_by_practice.items():
             successful = [r for r in results if r['success']]
             
             if successful:
                 times = [r['time'] for r in successful]
                 throughputs = [r['throughput'] for r in successful]
                 
-                print(f"\n{practice.upper()}:")
+                print(f"\n{practice.upper()} [{describe_host(host_id, hosts)}]:")
                 print(f"  Experimentos exitosos: {len(successful)}/{len(results)}")
                 print(f"  Tiempo promedio: {statistics.mean(times):.3f}s")
                 print(f"  Throughput promedio: {statistics.mean(throughputs):.2f} ops/s")
@@ -769,6 +4090,125 @@ def analyze_with_builtin(csv_file: Path):
     except Exception as e:
         print(f"❌ Error en análisis básico: {e}")
 
+def load_run_samples(csv_file: Path) -> Dict[Tuple[str, str, str], List[float]]:
+    """Tiempos exitosos de un CSV o almacén columnar por (host, práctica, configuración)
+    
+    Se descartan warm-ups y corridas servidas desde la caché: estas últimas son
+    copias de mediciones anteriores y duplicarían muestras en el test.
+    """
+    samples: Dict[Tuple[str, str, str], List[float]] = {}
+    for row in read_result_rows(csv_file, ANALYSIS_COLUMNS):
+        if is_true(row.get('warmup')) or is_true(row.get('cached')) or not is_true(row['success']):
+            continue
+        key = (row.get('host_id') or '', row['practice'], row['config'])
+        samples.setdefault(key, []).append(float(row['execution_time']))
+    return samples
+
+def result_samples(results: List[BenchmarkResult]) -> Dict[Tuple[str, str, str], List[float]]:
+    """Mismo agrupamiento que load_run_samples para resultados recién medidos"""
+    samples: Dict[Tuple[str, str, str], List[float]] = {}
+    for result in measured_runs(results):
+        if result.success and not result.cached:
+            samples.setdefault((result.host_id, result.practice, result.config), []).append(result.execution_time)
+    return samples
+
+def compare_samples(current: Dict[Tuple[str, str, str], List[float]],
+                    baseline: Dict[Tuple[str, str, str], List[float]],
+                    min_effect: float = COMPARE_MIN_EFFECT,
+                    alpha: float = COMPARE_ALPHA) -> List[Dict[str, Any]]:
+    """Comparar tiempos por configuración contra el baseline
+    
+    Se empareja primero con el mismo host; si el baseline no tiene ese host se
+    compara contra todas sus corridas de la configuración (marcado cross_host,
+    sólo informativo: no cuenta como regresión). Una configuración es
+    regresión (o mejora) si Mann-Whitney es significativo, el IC bootstrap de
+    la diferencia de medianas excluye el 0 y el cambio relativo de la mediana
+    supera min_effect. Si con esas corridas el test no puede llegar a p < alpha
+    el veredicto es 'insuficiente' (se reportan igual el cambio y el IC).
+    """
+    baseline_pooled: Dict[Tuple[str, str], List[float]] = {}
+    for (_, practice, config), times in baseline.items():
+        baseline_pooled.setdefault((practice, config), []).extend(times)
+    
+    comparisons = []
+    for (host_id, practice, config), times in current.items():
+        cross_host = (host_id, practice, config) not in baseline
+        base_times = baseline_pooled.get((practice, config), []) if cross_host else baseline[(host_id, practice, config)]
+        if not base_times:
+            continue
+        
+        entry = {
+            'practice': practice,
+            'config': config,
+            'host_id': host_id,
+            'cross_host': cross_host,
+            'baseline_runs': len(base_times),
+            'current_runs': len(times),
+            'baseline_median': statistics.median(base_times),
+            'current_median': statistics.median(times),
+            'change': None,
+            'change_ci_95': None,
+            'p_value': None,
+            'min_p_value': None,
+            'verdict': 'insuficiente'
+        }
+        if len(times) < COMPARE_MIN_SAMPLES or len(base_times) < COMPARE_MIN_SAMPLES:
+            comparisons.append(entry)
+            continue
+        
+        base_median = entry['baseline_median']
+        low, high = bootstrap_median_difference(times, base_times)
+        _, p_value = mann_whitney_u(times, base_times)
+        entry['change'] = (entry['current_median'] - base_median) / base_median
+        entry['change_ci_95'] = [low / base_median, high / base_median]
+        entry['p_value'] = p_value
+        entry['min_p_value'] = mann_whitney_min_p(len(times), len(base_times))
+        
+        if entry['min_p_value'] >= alpha:
+            entry['verdict'] = 'insuficiente'
+        elif p_value < alpha and low > 0 and entry['change'] > min_effect:
+            entry['verdict'] = 'regresión'
+        elif p_value < alpha and high < 0 and entry['change'] < -min_effect:
+            entry['verdict'] = 'mejora'
+        else:
+            entry['verdict'] = 'sin cambio'
+        comparisons.append(entry)
+    
+    return sorted(comparisons, key=lambda c: (c['practice'], c['config'], c['host_id']))
+
+def print_comparison(comparisons: List[Dict[str, Any]], min_effect: float = COMPARE_MIN_EFFECT) -> int:
+    """Imprimir la tabla de comparación y devolver el número de regresiones en el mismo host"""
+    print(f"\n=== COMPARACIÓN CONTRA BASELINE (tiempo de ejecución, efecto mínimo {min_effect:.0%}) ===")
+    if not comparisons:
+        print("  No hay configuraciones en común con el baseline")
+        return 0
+    
+    print(f"  {'Práctica':<12} {'Configuración':<40} {'Host':<8} {'Base':>9} {'Actual':>9} {'Cambio':>8} "
+          f"{'IC 95%':>17} {'p':>7}  Veredicto")
+    for c in comparisons:
+        change = f"{c['change']:+.1%}" if c['change'] is not None else '-'
+        ci = f"[{c['change_ci_95'][0]:+.1%},{c['change_ci_95'][1]:+.1%}]" if c['change_ci_95'] else '-'
+        p_value = f"{c['p_value']:.3f}" if c['p_value'] is not None else '-'
+        icon = {'regresión': '🔴', 'mejora': '🟢'}.get(c['verdict'], '  ')
+        note = ' (otro host, informativo)' if c['cross_host'] else ''
+        print(f"  {c['practice']:<12} {c['config'][:40]:<40} {c['host_id'][:8] or '?':<8} {c['baseline_median']:>8.3f}s {c['current_median']:>8.3f}s "
+              f"{change:>8} {ci:>17} {p_value:>7}  {icon} {c['verdict']}{note}")
+    
+    # Entre máquinas distintas las diferencias no son atribuibles al código: no bloquean
+    same_host = [c for c in comparisons if not c['cross_host']]
+    regressions = sum(1 for c in same_host if c['verdict'] == 'regresión')
+    improvements = sum(1 for c in same_host if c['verdict'] == 'mejora')
+    insufficient = sum(1 for c in same_host if c['verdict'] == 'insuficiente')
+    print(f"\n  Regresiones: {regressions}  Mejoras: {improvements}  Insuficiente: {insufficient}  "
+          f"Sin cambio: {len(same_host) - regressions - improvements - insufficient}")
+    if len(same_host) < len(comparisons):
+        print(f"  Comparaciones contra otro host (informativas, no bloquean): {len(comparisons) - len(same_host)}")
+    if insufficient:
+        needed = next(n for n in itertools.count(COMPARE_MIN_SAMPLES) if mann_whitney_min_p(n, n) < COMPARE_ALPHA)
+        print(f"  ⚠️  {insufficient} configuraciones con muy pocas corridas para p < {COMPARE_ALPHA} "
+              f"(se necesitan al menos {needed} por lado): aumente las repeticiones")
+    return regressions
+
 def create_pandas_plots(df):
     """Crear gráficas con pandas y matplotlib"""
     try:
@@ -904,8 +4344,105 @@ def generate_html_report(data_dir: Path):
 # FUNCIÓN PRINCIPAL Y CLI
 # ============================================================================
 
+def parse_since(value: str) -> str:
+    """'30d', '12h', '90m' o fecha ISO -> timestamp ISO para comparar con runs.timestamp"""
+    match = re.fullmatch(r'(\d+(?:\.\d+)?)([dhm])', value)
+    if match:
+        unit = {'d': 'days', 'h': 'hours', 'm': 'minutes'}[match.group(2)]
+        return (datetime.datetime.now() - datetime.timedelta(**{unit: float(match.group(1))})).isoformat()
+    return datetime.datetime.fromisoformat(value).isoformat()
+
+def query_main(argv: List[str]) -> int:
+    """Subcomando 'bench.py query': filtros y agregados sobre la base de datos de resultados"""
+    parser = argparse.ArgumentParser(
+        prog="bench.py query",
+        description="Consultar el histórico de resultados en SQLite",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Ejemplos:
+  python3 bench.py query p3_rw threads=8 --since 30d --stat p99
+  python3 bench.py query p1_counter --group-by host --metric throughput
+  python3 bench.py query p1_counter --metric mutex_overhead_vs_atomic --stat mean,max
+  python3 bench.py query --group-by day --since 7d
+  python3 bench.py query --import data/benchmark_results.csv
+        """
+    )
+    parser.add_argument('practice', nargs='?', choices=list(PRACTICE_CONFIGS.keys()),
+                        help='Filtrar por práctica')
+    parser.add_argument('filters', nargs='*', metavar='PARAM=VALOR',
+                        help='Filtrar por parámetros de la configuración (ej: threads=8)')
+    parser.add_argument('--db', type=Path, default=RESULTS_DB, help=f'Base de datos (default: {RESULTS_DB})')
+    parser.add_argument('--import', dest='import_csv', type=Path, metavar='CSV',
+                        help='Importar un CSV de resultados como una sesión')
+    parser.add_argument('--host', metavar='HOST_ID', help='Prefijo del host_id')
+    parser.add_argument('--since', help="Desde hace '30d', '12h', '90m' o una fecha ISO")
+    parser.add_argument('--until', help='Hasta una fecha ISO (exclusivo)')
+    parser.add_argument('--metric', default='execution_time',
+                        help=f"Columna ({', '.join(DB_RUN_COLUMNS)}) o métrica adicional (default: execution_time)")
+    parser.add_argument('--stat', default='count,mean,p50,p99',
+                        help='Agregados separados por coma: count, mean, stdev, min, max, median, pNN (default: count,mean,p50,p99)')
+    parser.add_argument('--group-by', choices=['config', 'practice', 'host', 'day', 'session'], default='config',
+                        help='Agrupar resultados (default: config)')
+    parser.add_argument('--include-warmup', action='store_true',
+                        help='Incluir corridas de warm-up y fallidas')
+    parser.add_argument('--json', action='store_true', help='Salida en JSON')
+    args = parser.parse_args(argv)
+    
+    stats = [stat.strip() for stat in args.stat.split(',') if stat.strip()]
+    try:
+        for stat in stats:
+            if stat not in DB_SIMPLE_STATS:
+                percentile_fraction(stat)
+    except ValueError as e:
+        parser.error(str(e))
+    try:
+        params = dict(item.split('=', 1) for item in args.filters)
+        params = {name: int(value) if value.lstrip('-').isdigit() else value for name, value in params.items()}
+        since = parse_since(args.since) if args.since else None
+        until = parse_since(args.until) if args.until else None
+    except ValueError as e:
+        parser.error(f"filtro inválido: {e}")
+    
+    database = ResultDatabase(args.db)
+    try:
+        if args.import_csv:
+            if not args.import_csv.exists():
+                print(f"❌ Archivo no encontrado: {args.import_csv}")
+                return 1
+            try:
+                rows, skipped = database.import_csv(args.import_csv)
+            except ValueError as e:
+                print(f"❌ {e}")
+                return 1
+            print(f"✅ {rows} filas importadas de {args.import_csv} a {args.db}"
+                  + (f", {skipped} omitidas (comentarios o incompletas)" if skipped else ""))
+            return 0
+        
+        rows = database.query(args.practice, params, args.host, since, until, args.metric,
+                              args.group_by, stats, args.include_warmup)
+    finally:
+        database.close()
+    
+    if args.json:
+        print(json.dumps(rows, indent=2, ensure_ascii=False))
+        return 0
+    if not rows:
+        print("Sin resultados para los filtros indicados")
+        return 1
+    
+    width = max(len(args.group_by), *(len(str(row['group'])) for row in rows))
+    print(f"{args.group_by:<{width}}  " + "  ".join(f"{stat:>12}" for stat in stats))
+    for row in rows:
+        cells = [f"{row[stat]:>12}" if stat == 'count' else f"{row[stat]:>12.6g}" for stat in stats]
+        print(f"{str(row['group']):<{width}}  " + "  ".join(cells))
+    return 0
+
 def main():
     """Función principal del script"""
+    # Subcomando de consultas sobre la base de datos (argumentos propios)
+    if len(sys.argv) > 1 and sys.argv[1] == 'query':
+        sys.exit(query_main(sys.argv[2:]))
+    
     parser = argparse.ArgumentParser(
         description="Sistema de Benchmarking para Lab06",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -914,8 +4451,26 @@ Ejemplos de uso:
   python3 bench.py p1_counter 4 100000 5          # Benchmark práctica 1
   python3 bench.py --all                           # Todas las prácticas
   python3 bench.py --analyze data/results.csv     # Analizar resultados
+  python3 bench.py --analyze data/benchmark_results.csv --host 3f2a  # Sólo un host
+  python3 bench.py --pipeline-log data/pipeline_log.txt --lookup-item 42
   python3 bench.py --report data/                  # Generar reporte HTML
+  python3 bench.py query p3_rw threads=8 --since 30d --stat p99  # Consultar el histórico (ver query -h)
+  python3 bench.py --all --columnar                # También guardar en data/results_store/
+  python3 bench.py --convert-csv data/benchmark_results.csv  # CSV -> almacén columnar
+  python3 bench.py --analyze data/results_store    # Analizar el almacén columnar
+  python3 bench.py --compare baseline.csv --analyze data/benchmark_results.csv
+  python3 bench.py p2_ring --compare baseline.csv --min-effect 0.1  # Medir y comparar
   python3 bench.py --quick p3_rw                  # Test rápido práctica 3
+  python3 bench.py --all --adaptive --target-ci 0.03  # Repetir hasta IC ±3%
+  python3 bench.py --all --sweep recommended      # Matrices recomendadas en notes.txt
+  python3 bench.py p1_counter --sweep "threads=1..16;iterations=log(1e4,1e6,3)"
+  python3 bench.py p2_ring --sweep pc_ratios       # Proporciones productor/consumidor
+  python3 bench.py p2_ring --sweep "producers,consumers=1/1,2/1,4/2;items=50000"
+  python3 bench.py p3_rw --optimize threads       # Buscar el número de hilos óptimo
+  python3 bench.py --all --perf-counters           # Contadores de hardware con perf stat
+  python3 bench.py --all --reuse                   # Re-medir sólo binarios modificados
+  python3 bench.py --all --resume                  # Continuar un barrido interrumpido
+  python3 bench.py --all --parallel                # Configuraciones y prácticas en paralelo por CPUs
         """
     )
     
@@ -927,13 +4482,56 @@ Ejemplos de uso:
                        help=f'Número de repeticiones (default: {DEFAULT_REPETITIONS})')
     
     parser.add_argument('--all', action='store_true', help='Ejecutar todas las prácticas')
-    parser.add_argument('--analyze', type=Path, help='Analizar archivo CSV de resultados')
+    parser.add_argument('--analyze', type=Path, help='Analizar archivo CSV de resultados o directorio del almacén columnar')
+    parser.add_argument('--columnar', type=Path, nargs='?', const=COLUMNAR_DIR, metavar='DIR',
+                       help=f'Guardar también los resultados en el almacén columnar (default: {COLUMNAR_DIR})')
+    parser.add_argument('--convert-csv', type=Path, metavar='CSV',
+                       help='Convertir un CSV de resultados al almacén columnar (destino: --columnar)')
+    parser.add_argument('--pipeline-log', type=Path, metavar='LOG',
+                       help='Analizar un log del pipeline (ej: data/pipeline_log.txt)')
+    parser.add_argument('--lookup-item', type=int, metavar='ID',
+                       help='Con --pipeline-log: indexar el log y mostrar las líneas de un ItemID')
+    parser.add_argument('--host', metavar='HOST_ID',
+                       help='Con --analyze: considerar sólo resultados de este host (prefijo del host_id)')
     parser.add_argument('--report', type=Path, help='Generar reporte HTML desde directorio')
+    parser.add_argument('--compare', type=Path, metavar='BASELINE',
+                       help='Comparar contra un CSV baseline (la corrida actual o --analyze); sale con '
+                            f'código {COMPARE_REGRESSION_EXIT} si hay regresiones significativas')
+    parser.add_argument('--min-effect', type=float, default=COMPARE_MIN_EFFECT,
+                       help=f'Con --compare: cambio relativo mínimo de la mediana (default: {COMPARE_MIN_EFFECT})')
     parser.add_argument('--quick', action='store_true', help='Modo rápido (menos repeticiones)')
     parser.add_argument('--timeout', type=int, default=DEFAULT_TIMEOUT, help='Timeout en segundos')
     parser.add_argument('--output', type=Path, help='Archivo de salida para resultados')
     parser.add_argument('--plots', action='store_true', help='Generar solo gráficas')
     parser.add_argument('--verbose', '-v', action='store_true', help='Output detallado')
+    parser.add_argument('--adaptive', action='store_true',
+                       help='Repeticiones adaptativas hasta alcanzar el IC objetivo')
+    parser.add_argument('--target-ci', type=float, default=ADAPTIVE_TARGET_CI,
+                       help=f'Semiancho relativo del IC 95%% en modo adaptativo (default: {ADAPTIVE_TARGET_CI})')
+    parser.add_argument('--max-reps', type=int, default=ADAPTIVE_MAX_REPETITIONS,
+                       help=f'Máximo de repeticiones por configuración en modo adaptativo (default: {ADAPTIVE_MAX_REPETITIONS})')
+    parser.add_argument('--time-budget', type=float, default=ADAPTIVE_TIME_BUDGET,
+                       help=f'Segundos máximos por configuración en modo adaptativo (default: {ADAPTIVE_TIME_BUDGET:.0f})')
+    parser.add_argument('--warmup', type=int, default=WARMUP_ITERATIONS,
+                       help=f'Corridas de calentamiento descartadas por configuración (default: {WARMUP_ITERATIONS})')
+    parser.add_argument('--warmup-tolerance', type=float, nargs='?', const=WARMUP_TOLERANCE, default=None,
+                       help=f'Detener el warm-up cuando dos tiempos consecutivos difieran menos que esto (default: {WARMUP_TOLERANCE})')
+    parser.add_argument('--cooldown-max', type=float, default=QUIESCENCE_MAX_WAIT,
+                       help=f'Segundos máximos esperando reposo entre repeticiones, 0 = sin espera (default: {QUIESCENCE_MAX_WAIT})')
+    parser.add_argument('--reuse', action='store_true',
+                       help='Reutilizar resultados cacheados de configuraciones sin cambios')
+    parser.add_argument('--resume', action='store_true',
+                       help='Reanudar un barrido interrumpido desde el journal, ejecutando sólo lo faltante')
+    parser.add_argument('--sweep', metavar='SPEC',
+                       help="Barrido de parámetros: predefinido ('recommended', 'pc_ratios'), archivo JSON o expresión 'dim=valores;...'")
+    parser.add_argument('--optimize', choices=['threads'],
+                       help='Buscar el valor de la dimensión que maximiza el throughput (requiere una práctica)')
+    parser.add_argument('--optimize-max', type=int, default=None,
+                       help='Límite superior de la búsqueda con --optimize (default: CPUs disponibles)')
+    parser.add_argument('--perf-counters', nargs='?', const=','.join(PERF_EVENTS), metavar='EVENTS',
+                       help=f"Medir con 'perf stat'; lista de eventos separada por comas (default: {','.join(PERF_EVENTS)})")
+    parser.add_argument('--parallel', action='store_true',
+                       help='Ejecutar configuraciones en paralelo sobre particiones disjuntas de CPUs')
     
     args = parser.parse_args()
     
@@ -946,8 +4544,45 @@ Ejemplos de uso:
         timeout = args.timeout
     
     # Funciones especiales
+    if args.compare and not args.compare.exists():
+        print(f"❌ Baseline no encontrado: {args.compare}")
+        sys.exit(1)
+    
+    if args.compare and not (args.all or args.practice):
+        current_file = args.analyze or args.output or RESULTS_FILE
+        if not current_file.exists():
+            print(f"❌ Archivo no encontrado: {current_file}")
+            sys.exit(1)
+        print(f"📊 Comparando {current_file} contra {args.compare}")
+        comparisons = compare_samples(load_run_samples(current_file), load_run_samples(args.compare),
+                                      args.min_effect)
+        if print_comparison(comparisons, args.min_effect):
+            sys.exit(COMPARE_REGRESSION_EXIT)
+        return
+    
+    if args.convert_csv:
+        store = ColumnarStore(args.columnar or COLUMNAR_DIR)
+        if store.backend is None:
+            print("❌ Se requiere pyarrow o numpy para el almacén columnar")
+            sys.exit(1)
+        if not args.convert_csv.exists():
+            print(f"❌ Archivo no encontrado: {args.convert_csv}")
+            sys.exit(1)
+        try:
+            rows, skipped = store.convert_csv(args.convert_csv)
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        print(f"✅ {rows} filas convertidas a {store.path} ({store.backend})"
+              + (f", {skipped} omitidas (comentarios o incompletas)" if skipped else ""))
+        return
+    
     if args.analyze:
-        analyze_csv_results(args.analyze)
+        analyze_csv_results(args.analyze, args.host)
+        return
+    
+    if args.pipeline_log:
+        print_pipeline_log_summary(args.pipeline_log, args.lookup_item)
         return
     
     if args.report:
@@ -967,21 +4602,48 @@ Ejemplos de uso:
         print("❌ Este script debe ejecutarse desde el directorio raíz del Lab06")
         sys.exit(1)
     
+    # Resolver el barrido antes de ejecutar para fallar temprano con specs inválidas
+    sweeps = None
+    if args.sweep:
+        practices = list(PRACTICE_CONFIGS.keys()) if args.all else [args.practice] if args.practice else []
+        try:
+            sweeps = load_sweeps(args.sweep, practices)
+            for practice, spec in sweeps.items():
+                expand_sweep(practice, spec)
+        except (ValueError, OSError) as e:
+            print(f"❌ Barrido inválido: {e}")
+            sys.exit(1)
+    
+    # La búsqueda del óptimo siempre mide cada sonda con repeticiones adaptativas
+    if args.optimize and (not args.practice or 'threads' not in PRACTICE_CONFIGS[args.practice]['args']):
+        print("❌ --optimize threads requiere una práctica con argumento threads "
+              "(p1_counter, p3_rw, p4_deadlock)")
+        sys.exit(1)
+    
     # Crear benchmarker
-    benchmarker = Lab06Benchmarker(repetitions=repetitions, timeout=timeout)
+    try:
+        benchmarker = Lab06Benchmarker(repetitions=repetitions, timeout=timeout, parallel=args.parallel,
+                                       adaptive=args.adaptive or bool(args.optimize), target_ci=args.target_ci,
+                                       max_repetitions=args.max_reps, time_budget=args.time_budget,
+                                       warmup=args.warmup, warmup_tolerance=args.warmup_tolerance,
+                                       cooldown_max=args.cooldown_max, reuse=args.reuse,
+                                       resume=args.resume, sweeps=sweeps,
+                                       perf_events=args.perf_counters.split(',') if args.perf_counters else None)
+    except FileExistsError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
     
     try:
         if args.all:
             # Ejecutar todas las prácticas
             benchmarker.log("INFO", "Iniciando benchmark completo de todas las prácticas")
             
-            for practice in PRACTICE_CONFIGS.keys():
-                try:
-                    benchmarker.run_practice_suite(practice)
-                    benchmarker.results.extend(benchmarker.suites[practice].results)
-                except Exception as e:
-                    benchmarker.log("ERROR", f"Error en práctica {practice}: {e}")
-                    continue
+            for suite in benchmarker.run_suites(list(PRACTICE_CONFIGS.keys())).values():
+                benchmarker.results.extend(suite.results)
+        
+        elif args.optimize:
+            suite = benchmarker.optimize_threads(args.practice, args.optimize_max)
+            benchmarker.results.extend(suite.results)
         
         elif args.practice:
             # Ejecutar práctica específica
@@ -989,26 +4651,18 @@ Ejemplos de uso:
                 # Ejecutar con parámetros específicos
                 practice = args.practice
                 
-                # Parsear parámetros según la práctica
-                params = {}
-                if practice == 'p1_counter' and len(args.params) >= 2:
-                    params = {'threads': int(args.params[0]), 'iterations': int(args.params[1])}
-                elif practice == 'p2_ring' and len(args.params) >= 3:
-                    params = {'producers': int(args.params[0]), 'consumers': int(args.params[1]), 'items': int(args.params[2])}
-                elif practice == 'p3_rw' and len(args.params) >= 2:
-                    params = {'threads': int(args.params[0]), 'operations': int(args.params[1])}
-                elif practice == 'p4_deadlock' and len(args.params) >= 1:
-                    params = {'threads': int(args.params[0]), 'skip_demo': 1}
-                elif practice == 'p5_pipeline' and len(args.params) >= 1:
-                    params = {'ticks': int(args.params[0])}
-                else:
-                    benchmarker.log("ERROR", f"Parámetros insuficientes para {practice}")
+                # Asignar parámetros posicionales a los argumentos del binario
+                config = PRACTICE_CONFIGS[practice]
+                defaults = config.get('defaults', {})
+                required = [name for name in config['args'] if name not in defaults]
+                if len(args.params) < len(required):
+                    benchmarker.log("ERROR", f"Parámetros insuficientes para {practice} (esperados: {', '.join(required)})")
                     sys.exit(1)
+                params = {**defaults, **{name: int(value) for name, value in zip(required, args.params)}}
+                params = {name: params[name] for name in config['args']}
                 
-                # Ejecutar benchmark individual múltiples veces
-                for i in range(repetitions):
-                    result = benchmarker.run_single_benchmark(practice, params)
-                    benchmarker.results.append(result)
+                # Misma ruta que las suites: warm-ups, journal (--resume) y caché (--reuse)
+                benchmarker.results.extend(benchmarker.run_params(practice, params))
                 
             else:
                 # Ejecutar suite completa
@@ -1023,6 +4677,13 @@ Ejemplos de uso:
         output_file = args.output or RESULTS_FILE
         benchmarker.save_results_csv(output_file)
         benchmarker.save_analysis_json()
+        benchmarker.save_sweep_table()
+        benchmarker.save_results_db()
+        if args.columnar:
+            benchmarker.save_results_columnar(args.columnar)
+        
+        # Resultados persistidos: el journal de este barrido ya no hace falta
+        benchmarker.journal.finish()
         
         # Generar gráficas
         benchmarker.generate_plots()
@@ -1031,8 +4692,9 @@ Ejemplos de uso:
         generate_html_report(DATA_DIR)
         
         # Mostrar resumen final
-        successful = len([r for r in benchmarker.results if r.success])
-        total = len(benchmarker.results)
+        measured = measured_runs(benchmarker.results)
+        successful = len([r for r in measured if r.success])
+        total = len(measured)
         
         print(f"\n🎉 Benchmark completado exitosamente!")
         print(f"   Experimentos exitosos: {successful}/{total} ({successful/total:.1%})")
@@ -1043,8 +4705,16 @@ Ejemplos de uso:
         if HAS_MATPLOTLIB:
             print(f"   Gráficas en: {DATA_DIR}/plots/")
         
+        # Bloquear regresiones contra el baseline
+        if args.compare:
+            comparisons = compare_samples(result_samples(benchmarker.results), load_run_samples(args.compare),
+                                          args.min_effect)
+            if print_comparison(comparisons, args.min_effect):
+                sys.exit(COMPARE_REGRESSION_EXIT)
+        
     except KeyboardInterrupt:
         benchmarker.log("WARN", "Benchmark interrumpido por el usuario")
+        benchmarker.log("INFO", f"Resultados parciales en {JOURNAL_FILE} - use --resume para continuar")
         sys.exit(130)
     
     except Exception as e:
@@ -1053,6 +4723,9 @@ Ejemplos de uso:
             import traceback
             traceback.print_exc()
         sys.exit(1)
+    
+    finally:
+        benchmarker.journal.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file